@@ -3648,15 +3648,7 @@ def update_session_memo():
         conn = sqlite3.connect(get_db_path())
         cursor = conn.cursor()
 
-        # セッションが存在するかチェック
-        cursor.execute(
-            "SELECT session_id FROM session_stats WHERE session_id = ?", (session_id,)
-        )
-        if not cursor.fetchone():
-            conn.close()
-            return jsonify({"error": "セッションが見つかりません"}), 404
-
-        # メモを更新
+        # メモを更新（更新件数が0ならセッションが存在しない）
         cursor.execute(
             """
             UPDATE session_stats 
@@ -3665,6 +3657,9 @@ def update_session_memo():
         """,
             (memo, get_app_datetime_string(), session_id),
         )
+        if cursor.rowcount == 0:
+            conn.close()
+            return jsonify({"error": "セッションが見つかりません"}), 404
 
         conn.commit()
         conn.close()
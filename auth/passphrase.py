@@ -13,7 +13,8 @@ class PassphraseValidator:
     """パスフレーズバリデーション機能"""
     
     # 許可する文字パターン (ASCII: 0-9, a-z, A-Z, _, -)
-    ALLOWED_PATTERN = re.compile(r'^[0-9a-zA-Z_-]+$')
+    # fullmatch で使用する（"$" は末尾の改行にも一致するため使わない）
+    ALLOWED_PATTERN = re.compile(r'[0-9a-zA-Z_-]+')
     
     # 文字数制限
     MIN_LENGTH = 32
@@ -44,7 +45,7 @@ class PassphraseValidator:
             return False, f"パスフレーズは{cls.MAX_LENGTH}文字以下である必要があります"
         
         # 文字種チェック
-        if not cls.ALLOWED_PATTERN.match(passphrase):
+        if not cls.ALLOWED_PATTERN.fullmatch(passphrase):
             return False, "パスフレーズは0-9, a-z, A-Z, _, - の文字のみ使用可能です"
         
         return True, "有効なパスフレーズです"
@@ -125,12 +126,12 @@ class PassphraseManager:
         
         try:
             # 現在の値を取得（履歴用）
-            self.db.row_factory = sqlite3.Row
+            # 共有接続の row_factory は変更せず、位置でアクセスする
             current_row = self.db.execute(
                 'SELECT value FROM settings WHERE key = ?', 
                 ('shared_passphrase',)
             ).fetchone()
-            old_value = current_row['value'] if current_row else None
+            old_value = current_row[0] if current_row else None
             
             # 設定を更新
             self.db.execute('''
@@ -172,7 +173,6 @@ class PassphraseManager:
         """
         try:
             # データベースから取得
-            self.db.row_factory = sqlite3.Row
             row = self.db.execute(
                 'SELECT value FROM settings WHERE key = ?', 
                 ('shared_passphrase',)
@@ -181,7 +181,7 @@ class PassphraseManager:
             if not row:
                 return False
             
-            stored_value = row['value']
+            stored_value = row[0]
             
             # ハッシュ値とソルトを分離
             if ':' in stored_value:
@@ -218,8 +218,10 @@ class PassphraseManager:
             dict: パスフレーズ情報
         """
         try:
-            self.db.row_factory = sqlite3.Row
-            row = self.db.execute(
+            # 共有接続ではなく一時カーソルにのみ row_factory を設定する
+            cursor = self.db.cursor()
+            cursor.row_factory = sqlite3.Row
+            row = cursor.execute(
                 'SELECT updated_at, updated_by FROM settings WHERE key = ?', 
                 ('shared_passphrase',)
             ).fetchone()
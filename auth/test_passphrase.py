@@ -41,6 +41,7 @@ class TestPassphraseValidator(unittest.TestCase):
             'パスフレーズ' + 'a' * 28,  # 日本語
             'emoji😀passphrase' + 'a' * 15,  # 絵文字
             'special!characters' + 'a' * 13,  # 特殊文字
+            'a' * 31 + '\n',  # 末尾の改行
         ]
         
         for passphrase in invalid_passphrases:
@@ -179,6 +180,18 @@ class TestPassphraseManager(unittest.TestCase):
         self.assertIsNotNone(row)
         self.assertIn(':', row['value'])  # ハッシュ:ソルト形式
     
+    def test_manager_keeps_row_factory(self):
+        """PassphraseManager が共有接続の row_factory を変更しないことを確認"""
+        self.conn.row_factory = None
+        manager = PassphraseManager(self.conn)
+        passphrase = 'test_passphrase_32chars_minimum_length'
+        
+        success, message = manager.set_passphrase(passphrase, 'test_user')
+        self.assertTrue(success, message)
+        self.assertTrue(manager.verify_passphrase(passphrase))
+        self.assertEqual(manager.get_passphrase_info()['updated_by'], 'test_user')
+        self.assertIsNone(self.conn.row_factory)
+    
     def test_set_invalid_passphrase(self):
         """無効なパスフレーズ設定のテスト"""
         manager = PassphraseManager(self.conn)
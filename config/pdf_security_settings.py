@@ -8,7 +8,10 @@ import re
 import sqlite3
 from urllib.parse import urlparse
 
-from database.models import get_setting, set_setting
+from database.models import get_setting, get_settings, set_setting
+
+# ドメイン名の簡易チェック用パターン
+_DOMAIN_RE = re.compile(r"^[a-zA-Z0-9.-]+$")
 
 
 def get_pdf_security_config():
@@ -19,40 +22,35 @@ def get_pdf_security_config():
     try:
         conn = sqlite3.connect("instance/database.db")
 
-        # 各設定項目を取得
-        config = {
-            "enabled": get_setting(
-                conn,
-                "pdf_download_prevention_enabled",
-                _get_env_bool("PDF_DOWNLOAD_PREVENTION_ENABLED", True),
-            ),
-            "allowed_referrer_domains": get_setting(
-                conn,
-                "pdf_allowed_referrer_domains",
-                _get_env_list(
+        # 各設定項目を1回のクエリで取得
+        settings = get_settings(
+            conn,
+            {
+                "pdf_download_prevention_enabled": _get_env_bool(
+                    "PDF_DOWNLOAD_PREVENTION_ENABLED", True
+                ),
+                "pdf_allowed_referrer_domains": _get_env_list(
                     "PDF_ALLOWED_REFERRER_DOMAINS", ["localhost", "127.0.0.1"]
                 ),
-            ),
-            "blocked_user_agents": get_setting(
-                conn,
-                "pdf_blocked_user_agents",
-                _get_env_list(
+                "pdf_blocked_user_agents": _get_env_list(
                     "PDF_BLOCKED_USER_AGENTS", ["wget", "curl", "python-requests"]
                 ),
-            ),
-            "strict_mode": get_setting(
-                conn, "pdf_strict_mode", _get_env_bool("PDF_STRICT_MODE", False)
-            ),
-            "log_blocked_attempts": get_setting(
-                conn,
-                "pdf_log_blocked_attempts",
-                _get_env_bool("PDF_LOG_BLOCKED_ATTEMPTS", True),
-            ),
-            "user_agent_check_enabled": get_setting(
-                conn,
-                "pdf_user_agent_check_enabled",
-                _get_env_bool("PDF_USER_AGENT_CHECK_ENABLED", True),
-            ),
+                "pdf_strict_mode": _get_env_bool("PDF_STRICT_MODE", False),
+                "pdf_log_blocked_attempts": _get_env_bool(
+                    "PDF_LOG_BLOCKED_ATTEMPTS", True
+                ),
+                "pdf_user_agent_check_enabled": _get_env_bool(
+                    "PDF_USER_AGENT_CHECK_ENABLED", True
+                ),
+            },
+        )
+        config = {
+            "enabled": settings["pdf_download_prevention_enabled"],
+            "allowed_referrer_domains": settings["pdf_allowed_referrer_domains"],
+            "blocked_user_agents": settings["pdf_blocked_user_agents"],
+            "strict_mode": settings["pdf_strict_mode"],
+            "log_blocked_attempts": settings["pdf_log_blocked_attempts"],
+            "user_agent_check_enabled": settings["pdf_user_agent_check_enabled"],
         }
 
         conn.close()
@@ -446,7 +444,7 @@ def validate_allowed_domains(domains):
                 pass
 
             # ドメイン名のチェック（簡易）
-            if not re.match(r"^[a-zA-Z0-9.-]+$", domain):
+            if not _DOMAIN_RE.match(domain):
                 result["warnings"].append(f"疑わしいドメイン名: {domain}")
 
         except (
@@ -8,7 +8,9 @@
 タイムゾーンを使用する。未指定の場合はAsia/Tokyoがデフォルト。
 """
 
+import math
 import os
+import threading
 import pytz
 from datetime import datetime, timedelta
 import logging
@@ -27,6 +29,10 @@ except pytz.exceptions.UnknownTimeZoneError:
     APP_TZ = pytz.timezone('Asia/Tokyo')
     TIMEZONE = 'Asia/Tokyo'
 
+# format_for_display の直近結果をスレッドごとに1件だけ保持するキャッシュ
+# （同一秒内のログ出力が続く場合に strftime を省略する）
+_fmt_cache = threading.local()
+
 def get_app_timezone():
     """
     アプリケーション統一タイムゾーンを取得
@@ -127,7 +133,17 @@ def format_for_display(dt):
         dt = APP_TZ.localize(dt)
     else:
         dt = dt.astimezone(APP_TZ)
-    return dt.strftime('%Y年%m月%d日 %H:%M:%S')
+
+    # 表示は秒単位のため、UNIX秒が同じなら前回の文字列を再利用
+    # （1970年以前の負の時刻でも秒の境界がずれないよう切り捨てる）
+    ts = math.floor(dt.timestamp())
+    if getattr(_fmt_cache, 'last_ts', None) == ts:
+        return _fmt_cache.last_str
+
+    formatted = dt.strftime('%Y年%m月%d日 %H:%M:%S')
+    _fmt_cache.last_ts = ts
+    _fmt_cache.last_str = formatted
+    return formatted
 
 def get_timezone_info():
     """
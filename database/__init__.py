@@ -8,6 +8,14 @@ def get_db_connection():
     """データベース接続を取得"""
     conn = sqlite3.connect(DATABASE_PATH)
     conn.row_factory = sqlite3.Row  # 辞書形式でアクセス可能
+    # WALモードでは NORMAL でもコミットの一貫性は保たれる（接続単位の設定）
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # 一時テーブル・ソート用領域をメモリ上に確保
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # ページキャッシュ約20MB（負値はKiB指定）
+    conn.execute("PRAGMA cache_size=-20000")
+    # 読み取りをメモリマップ経由で行い read() システムコールを削減（最大256MB）
+    conn.execute("PRAGMA mmap_size=268435456")
     return conn
 
 @contextmanager
@@ -31,6 +39,11 @@ def init_db():
     os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
     
     with get_db() as db:
+        # WALはDBファイルに永続化されるため初期化時に一度だけ設定
+        # （バックアップ等の読み取り中もアプリ側の書き込みがブロックされない）
+        db.execute("PRAGMA journal_mode=WAL")
+        # テーブル作成と初期データ投入をまとめて1回のコミットで確定する
+        db.execute("BEGIN")
         create_tables(db)
         insert_initial_data(db)
     
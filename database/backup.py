@@ -5,18 +5,353 @@ BackupManagerクラス - コア機能実装
 import os
 import sqlite3
 import tarfile
+import gzip
 import json
 import hashlib
 import shutil
+import subprocess
 import re
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 import tempfile
+import threading
+from pathlib import Path
 import logging
 from config.timezone import get_app_now, to_app_timezone
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# バックアップタイプ（アーカイブ保存先ディレクトリ名）
+BACKUP_TYPES = ("manual", "auto", "pre_restore")
+
+# アーカイブ形式（拡張子・読み込みモード）
+# gzip 以外の形式に切り替える場合はここと _create_archive を変更する
+ARCHIVE_EXTENSION = ".tar.gz"
+ARCHIVE_READ_MODE = "r:gz"
+
+# 許可するバックアップ名の形式
+SAFE_BACKUP_NAME_RE = re.compile(r"(?:backup|pre_restore)_\d{8}_\d{6}", re.ASCII)
+
+# アーカイブのgzip圧縮レベル（デフォルト）
+# PDFは内部で圧縮済みのため、レベル9にしても圧縮率はほぼ変わらず時間だけ増える
+ARCHIVE_COMPRESSION_LEVEL = 6
+
+# チェックサム計算時の読み込みバッファサイズ（hashlib.file_digest 非対応環境用）
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+# アーカイブ書き込み時のバッファサイズ
+# （小さな write() を8MiB単位にまとめ、ネットワークFS等でのシステムコールを削減）
+ARCHIVE_WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+TAR_STREAM_BUFSIZE = 512 * 1024
+
+# ファイル・パイプの読み書きバッファサイズ
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# .env のキー=値 行（コメント行を除く）。グループ1は "=" より前の部分
+ENV_ASSIGNMENT_RE = re.compile(r"^(?![^\S\n]*#)([^=\n]*)=.*$", re.MULTILINE)
+
+# 一括読み込みで処理する設定ファイルサイズの上限
+SMALL_CONFIG_FILE_SIZE = 1024 * 1024
+
+# SQLite オンラインバックアップの1ステップあたりのコピーページ数と、ステップ間の待機秒数
+# （全ページを1回でコピーするとアプリ側の書き込みを長時間ブロックするため分割する）
+DB_BACKUP_PAGES_PER_STEP = 1024
+DB_BACKUP_STEP_SLEEP = 0.0025
+
+# バックアップ一覧キャッシュを保存しない期間（ナノ秒）
+# ディレクトリの更新日時はカーネルの時刻粒度で丸められるため、直近に更新された
+# ディレクトリでは同一時刻内の後続の変更を検知できない
+LIST_CACHE_RACY_WINDOW_NS = 1_000_000_000
+
+# コンポーネント（DB・設定・PDF・ログ）バックアップの並列数
+BACKUP_COMPONENT_WORKERS = 4
+
+# バックアップ一覧のキャッシュ {バックアップディレクトリの絶対パス: (ディレクトリ更新日時, 一覧)}
+# BackupManager はリクエスト毎に生成されるため、インスタンスではなくモジュール単位で保持する
+_backups_list_cache: Dict[str, Tuple[Tuple[int, ...], List[Dict]]] = {}
+
+# 一覧キャッシュの破棄回数 {バックアップディレクトリの絶対パス: 世代番号}
+# 走査中に破棄された場合、走査結果を古い一覧として保存しないために使用する
+_backups_list_generation: Dict[str, int] = {}
+
+# メタデータファイルの解析結果キャッシュ {絶対パス: (mtime_ns, メタデータ)}
+_metadata_cache: Dict[str, Tuple[int, Dict]] = {}
+
+# 一覧・メタデータキャッシュの読み書きを保護するロック（リクエスト処理スレッド間で共有）
+_list_cache_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_created_at(created_at: str) -> datetime:
+    """
+    メタデータの created_at をアプリケーションタイムゾーンの datetime に変換
+
+    世代管理・自動バックアップ判定で同じ文字列を繰り返し解析するため結果をキャッシュする。
+    （メタデータ辞書は API でそのまま返すため、解析結果は辞書に格納しない）
+
+    Args:
+        created_at: ISO 8601 形式の作成日時
+
+    Returns:
+        datetime: アプリケーションタイムゾーンの作成日時
+    """
+    return to_app_timezone(datetime.fromisoformat(created_at))
+
+
+def _integrity_sha256():
+    """
+    整合性確認用のSHA256ハッシュオブジェクトを生成
+
+    バックアップのチェックサムは改ざん検知ではなく破損検知用途のため、
+    usedforsecurity=False を指定する（FIPSビルドでの制約を回避）。
+    """
+    return hashlib.sha256(usedforsecurity=False)
+
+
+def _load_json_file(path: str) -> Dict:
+    """
+    JSONファイルの読み込み（orjson が利用可能な場合は orjson で解析）
+
+    Args:
+        path: JSONファイルのパス
+
+    Returns:
+        Dict: 解析結果
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_json_file(path: str, data: Dict, pretty: bool = False):
+    """
+    JSONファイルの書き込み（orjson が利用可能な場合は orjson で生成）
+
+    Args:
+        path: 出力先JSONファイルのパス
+        data: 書き込むデータ
+        pretty: インデント付きで出力するか（人が編集する設定ファイル用）
+    """
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    elif pretty:
+        content = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    else:
+        content = json.dumps(
+            data, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def _open_archive_file(path: str):
+    """
+    アーカイブ出力ファイルを所有者のみ読み書き可能な権限（600）で作成
+
+    作成後に chmod すると一時的に緩い権限のファイルが存在するため、
+    os.open の作成モードで権限を指定する。
+
+    Args:
+        path: 出力先ファイルパス
+
+    Returns:
+        バッファ付きのバイナリ書き込み用ファイルオブジェクト
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    return os.fdopen(fd, "wb", buffering=ARCHIVE_WRITE_BUFFER_SIZE)
+
+
+def _iter_scandir(root: str) -> Iterator[Tuple[str, str, bool]]:
+    """
+    os.scandir によるディレクトリツリーの走査（1回のトラバースで完結）
+
+    シンボリックリンクのディレクトリは辿らない。ディレクトリは配下の
+    エントリより先に返す。
+
+    Args:
+        root: 走査するディレクトリ
+
+    Yields:
+        Tuple[str, str, bool]: (パス, root からの相対パス（"/" 区切り）, ディレクトリか)
+    """
+    pending = [(root, "")]
+    while pending:
+        source_dir, rel_dir = pending.pop()
+        # ディレクトリ単位で接頭辞を作成し、エントリごとの join を省く
+        rel_prefix = rel_dir + "/" if rel_dir else ""
+        with os.scandir(source_dir) as entries:
+            for entry in entries:
+                rel_path = rel_prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    yield entry.path, rel_path, True
+                    pending.append((entry.path, rel_path))
+                elif entry.is_file():
+                    yield entry.path, rel_path, False
+
+
+class HashingWriter:
+    """
+    書き込まれたバイト列のSHA256を逐次計算するファイルラッパー
+
+    アーカイブ書き込みと同時にチェックサムを求めることで、
+    作成後にアーカイブ全体を再読み込みする処理を省く。
+    """
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._hash = _integrity_sha256()
+
+    def write(self, data) -> int:
+        self._hash.update(data)
+        return self._fileobj.write(data)
+
+    def flush(self):
+        self._fileobj.flush()
+
+    @property
+    def checksum(self) -> str:
+        """sha256:<hex> 形式のチェックサム"""
+        return f"sha256:{self._hash.hexdigest()}"
+
+
+class _ProcessGzipMember:
+    """
+    外部圧縮コマンド（pigz / gzip）で1つの gzip メンバーを書き出すライター
+
+    標準入力へ書き込んだデータを圧縮し、標準出力をスレッドで出力先へ転送する。
+    """
+
+    def __init__(self, command: List[str], fileobj):
+        self._command = command
+        self._fileobj = fileobj
+        self._error = None
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=COPY_BUFFER_SIZE,
+        )
+        self._pump = threading.Thread(target=self._pump_output, daemon=True)
+        self._pump.start()
+
+    def _pump_output(self):
+        try:
+            for chunk in iter(
+                lambda: self._process.stdout.read(COPY_BUFFER_SIZE), b""
+            ):
+                self._fileobj.write(chunk)
+        except Exception as e:
+            self._error = e
+            # 標準出力を読み残すと圧縮コマンドがパイプへの書き込みで停止し、
+            # write() の標準入力への書き込みも戻らなくなるため終了させる
+            self._process.kill()
+
+    def _raise_pump_error(self):
+        """出力転送スレッドで発生した例外を送出"""
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data):
+        self._raise_pump_error()
+        try:
+            self._process.stdin.write(data)
+        except BrokenPipeError:
+            # 出力失敗で圧縮コマンドを終了させた場合は元の例外を優先する
+            self._raise_pump_error()
+            raise
+        self._raise_pump_error()
+
+    def close(self):
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        finally:
+            self._pump.join()
+            self._process.stdout.close()
+            returncode = self._process.wait()
+
+        self._raise_pump_error()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, self._command)
+
+
+class MultiMemberGzipWriter:
+    """
+    gzip メンバー単位で圧縮レベルを切り替えて書き出すファイルラッパー
+
+    複数の gzip メンバーを連結したファイルは単一の gzip ストリームとして
+    展開されるため、出力は通常の .tar.gz（tar -xzf / tarfile "r:gz"）のまま。
+    圧縮するメンバーは外部圧縮コマンドが利用可能ならそれを使用する。
+    """
+
+    def __init__(
+        self,
+        fileobj,
+        compress_command: Optional[Callable[[int], Optional[List[str]]]] = None,
+    ):
+        self._fileobj = fileobj
+        self._compress_command = compress_command
+        self._member = None
+        self._compresslevel = None
+        self._offset = 0
+
+    def set_compresslevel(self, compresslevel: int):
+        """
+        以降の書き込みに使用する圧縮レベルを設定（変更時は新しいメンバーを開始）
+
+        Args:
+            compresslevel: gzip圧縮レベル（0は無圧縮で格納）
+        """
+        if compresslevel == self._compresslevel:
+            return
+        self._close_member()
+
+        # 無圧縮メンバーはCRC計算のみのため、プロセス起動せずに gzip モジュールで書き出す
+        command = None
+        if compresslevel > 0 and self._compress_command is not None:
+            command = self._compress_command(compresslevel)
+
+        if command:
+            try:
+                self._member = _ProcessGzipMember(command, self._fileobj)
+            except OSError as e:
+                logger.warning(f"圧縮コマンドを起動できないため gzip モジュールを使用: {e}")
+        if self._member is None:
+            self._member = gzip.GzipFile(
+                fileobj=self._fileobj, mode="wb", compresslevel=compresslevel
+            )
+        self._compresslevel = compresslevel
+
+    def write(self, data) -> int:
+        self._member.write(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """圧縮前のストリーム位置（tarfile のオフセット管理用）"""
+        return self._offset
+
+    def close(self):
+        self._close_member()
+
+    def _close_member(self):
+        if self._member is not None:
+            member = self._member
+            self._member = None
+            self._compresslevel = None
+            member.close()
+
 
 class BackupManager:
     """
@@ -77,6 +412,10 @@ class BackupManager:
             "AUTH",
             "KEY",
         ]
+        # マスク判定用にキーワードを1つの正規表現にまとめて保持
+        self._sensitive_re = re.compile(
+            "|".join(map(re.escape, self.sensitive_keys)), re.IGNORECASE
+        )
 
         # Phase 2: バックアップ設定ファイルパス (config/ ディレクトリに統合)
         self.settings_file = os.path.join(
@@ -87,15 +426,16 @@ class BackupManager:
         """バックアップディレクトリ構造を作成"""
         directories = [
             self.backup_dir,
-            os.path.join(self.backup_dir, "manual"),
-            os.path.join(self.backup_dir, "auto"),
             os.path.join(self.backup_dir, "metadata"),
-            os.path.join(self.backup_dir, "pre_restore"),
+        ] + [
+            os.path.join(self.backup_dir, backup_type)
+            for backup_type in BACKUP_TYPES
         ]
 
         for directory in directories:
-            os.makedirs(directory, exist_ok=True)
-            # セキュアな権限設定（所有者のみアクセス可能）
+            # 新規作成時から所有者のみアクセス可能な権限で作成
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # 既存ディレクトリ・umask の影響分も含めて権限を保証
             os.chmod(directory, 0o700)
 
     def create_backup(self, backup_type: str = "manual") -> str:
@@ -114,40 +454,75 @@ class BackupManager:
             backup_name = f"backup_{timestamp}"
 
             logger.info(f"バックアップ開始: {backup_name}")
+            settings = self.get_backup_settings()
 
             # 一時作業ディレクトリ作成
             with tempfile.TemporaryDirectory() as temp_dir:
                 backup_data_dir = os.path.join(temp_dir, backup_name)
                 os.makedirs(backup_data_dir)
 
-                # 各コンポーネントのバックアップ実行
-                database_files = self._backup_database(backup_data_dir)
-                config_files = self._backup_config_files(backup_data_dir)
-                pdf_files = self._backup_pdf_files(backup_data_dir)
-                log_files = self._backup_log_files(backup_data_dir)
+                # 各コンポーネントのバックアップを並列実行
+                # （対象ディレクトリが独立しておりI/O待ちが中心のため）
+                with ThreadPoolExecutor(
+                    max_workers=BACKUP_COMPONENT_WORKERS
+                ) as executor:
+                    database_future = executor.submit(
+                        self._backup_database,
+                        backup_data_dir,
+                        settings["db_backup_pages"],
+                    )
+                    config_future = executor.submit(
+                        self._backup_config_files, backup_data_dir
+                    )
+                    pdf_future = executor.submit(self._backup_pdf_files)
+                    log_future = executor.submit(self._backup_log_files)
+
+                    database_files = database_future.result()
+                    config_files = config_future.result()
+                    pdf_entries, pdf_files = pdf_future.result()
+                    log_entries, log_files = log_future.result()
 
                 # メタデータ作成
+                # ファイル一覧はメタデータJSONではなくアーカイブ内の files.txt に記録
+                # （PDF・ログはアーカイブ内パス、それ以外は作業ディレクトリからの相対パス）
+                staged_files = database_files + config_files
+                with open(
+                    os.path.join(backup_data_dir, "files.txt"), "w", encoding="utf-8"
+                ) as f:
+                    f.writelines(
+                        os.path.relpath(path, backup_data_dir) + "\n"
+                        for path in staged_files
+                    )
+                    f.writelines(arcname + "\n" for arcname in log_files)
+                    f.writelines(arcname + "\n" for arcname in pdf_files)
+
                 metadata = self._create_metadata(
                     backup_name,
                     backup_type,
                     timestamp,
-                    database_files + config_files + pdf_files + log_files,
+                    {
+                        "database": len(database_files),
+                        "config": len(config_files),
+                        "pdfs": len(pdf_files),
+                        "logs": len(log_files),
+                    },
                 )
 
                 # メタデータファイル保存
                 metadata_content = os.path.join(
                     backup_data_dir, "metadata.json"
                 )
-                with open(metadata_content, "w", encoding="utf-8") as f:
-                    json.dump(metadata, f, indent=2, ensure_ascii=False)
+                _dump_json_file(metadata_content, metadata)
 
-                # アーカイブ作成
-                archive_path = self._create_archive(
-                    backup_data_dir, backup_name, backup_type
+                # アーカイブ作成（チェックサムは書き込みと同時に計算）
+                archive_path, checksum = self._create_archive(
+                    backup_data_dir,
+                    backup_name,
+                    backup_type,
+                    compresslevel=settings["compression_level"],
+                    entries=log_entries,
+                    stored_entries=pdf_entries,
                 )
-
-                # チェックサム計算
-                checksum = self._calculate_checksum(archive_path)
                 metadata["checksum"] = checksum
                 metadata["size"] = os.path.getsize(archive_path)
 
@@ -155,8 +530,8 @@ class BackupManager:
                 metadata_file = os.path.join(
                     self.backup_dir, "metadata", f"{backup_name}.json"
                 )
-                with open(metadata_file, "w", encoding="utf-8") as f:
-                    json.dump(metadata, f, indent=2, ensure_ascii=False)
+                _dump_json_file(metadata_file, metadata)
+                self._invalidate_backups_cache()
 
                 logger.info(
                     f"バックアップ完了: {backup_name}, "
@@ -168,12 +543,15 @@ class BackupManager:
             logger.error(f"バックアップ作成中にエラーが発生: {str(e)}")
             raise
 
-    def _backup_database(self, backup_dir: str) -> List[str]:
+    def _backup_database(
+        self, backup_dir: str, pages: int = DB_BACKUP_PAGES_PER_STEP
+    ) -> List[str]:
         """
         SQLiteデータベースの安全バックアップ
 
         Args:
             backup_dir: バックアップ先ディレクトリ
+            pages: オンラインバックアップの1ステップあたりのコピーページ数（-1で一括）
 
         Returns:
             List[str]: バックアップされたファイルのリスト
@@ -188,21 +566,46 @@ class BackupManager:
             backup_db_path = os.path.join(database_dir, "database.db")
 
             # SQLite .backup コマンドを使用した安全なバックアップ
-            source_conn = sqlite3.connect(self.db_path, timeout=30.0)
-            source_conn.execute("PRAGMA journal_mode=WAL")  # WALモード有効化
+            # journal_mode はDBファイルに永続化される設定のため、ここでは変更しない
+            # （WALの有効化はアプリケーション側のDB初期化 init_db で一度だけ行う）
+            self._checkpoint_wal()
+
+            # バックアップ元は読み取り専用で開く
+            source_conn = sqlite3.connect(
+                f"{Path(self.db_path).absolute().as_uri()}?mode=ro",
+                uri=True,
+                timeout=30.0,
+            )
             backup_conn = sqlite3.connect(backup_db_path, timeout=30.0)
 
             try:
-                source_conn.backup(backup_conn)
+                self._configure_source_conn(source_conn)
+
+                # コピー先は一時ファイルのため、ページ書き込みごとの fsync を省略
+                backup_conn.execute("PRAGMA synchronous=OFF")
+
+                # ステップ間でロックを解放し、アプリ側の書き込みを待たせない
+                source_conn.backup(
+                    backup_conn,
+                    pages=pages,
+                    sleep=DB_BACKUP_STEP_SLEEP,
+                    progress=lambda status, remaining, total: logger.debug(
+                        f"データベースバックアップ進捗: {total - remaining}/{total}"
+                    ),
+                )
                 files.append(backup_db_path)
                 logger.info(f"データベースバックアップ完了: {backup_db_path}")
 
                 # スキーマ情報もエクスポート
+                # （iterdump は全行をSQL化するため、sqlite_master からDDLのみ取得）
                 schema_path = os.path.join(database_dir, "database_schema.sql")
-                with open(schema_path, "w") as f:
-                    for line in source_conn.iterdump():
-                        if line.startswith("CREATE"):
-                            f.write(f"{line}\n")
+                # 作成順（rowid）で出力し、テーブル→インデックスの順で再実行可能にする
+                cursor = source_conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL "
+                    "ORDER BY rowid"
+                )
+                with open(schema_path, "w", encoding="utf-8") as f:
+                    f.writelines(f"{row[0]};\n" for row in cursor)
                 files.append(schema_path)
 
             except Exception as e:
@@ -214,6 +617,45 @@ class BackupManager:
 
         return files
 
+    def _checkpoint_wal(self):
+        """
+        バックアップ前にWALをDB本体へ反映して切り詰める（ベストエフォート）
+
+        WALが大きいとバックアップ時のページ読み込みごとにWAL索引の参照が増えるため、
+        読み取り専用のバックアップ元接続とは別の接続で事前にチェックポイントを行う。
+        アプリ側の読み書きで完了できない場合も、バックアップ自体は継続する。
+        """
+        wal_path = f"{self.db_path}-wal"
+        try:
+            if os.path.getsize(wal_path) == 0:
+                return
+        except OSError:
+            # WALモードでない（WALファイルが存在しない）
+            return
+
+        conn = sqlite3.connect(self.db_path, timeout=1.0)
+        try:
+            busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+            if busy:
+                logger.debug("WALチェックポイントは他の接続の使用中のため未完了")
+        except sqlite3.Error as e:
+            logger.warning(f"WALチェックポイントエラー: {str(e)}")
+        finally:
+            conn.close()
+
+    def _configure_source_conn(self, conn: sqlite3.Connection):
+        """
+        バックアップ元DB接続の設定
+
+        読み取り専用とし、バックアップ中にこの接続からチェックポイントを
+        発生させない（チェックポイントはアプリ側の書き込み接続に任せる）。
+
+        Args:
+            conn: バックアップ元データベースへの接続
+        """
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+
     def _backup_config_files(self, backup_dir: str) -> List[str]:
         """
         設定ファイルのバックアップ（機密情報マスク処理）
@@ -233,11 +675,20 @@ class BackupManager:
             backup_env_path = os.path.join(config_dir, ".env")
 
             # .envファイルの機密情報マスク処理
-            with open(self.env_path, "r", encoding="utf-8") as source:
+            if os.path.getsize(self.env_path) < SMALL_CONFIG_FILE_SIZE:
+                # 小さいファイルは一括で読み込み、1回の正規表現置換でマスク
+                with open(self.env_path, "r", encoding="utf-8") as source:
+                    text = source.read()
                 with open(backup_env_path, "w", encoding="utf-8") as backup:
+                    backup.write(ENV_ASSIGNMENT_RE.sub(self._mask_env_match, text))
+            else:
+                with open(
+                    self.env_path, "r", encoding="utf-8", buffering=COPY_BUFFER_SIZE
+                ) as source, open(
+                    backup_env_path, "w", encoding="utf-8", buffering=COPY_BUFFER_SIZE
+                ) as backup:
                     for line in source:
-                        masked_line = self._mask_sensitive_info(line)
-                        backup.write(masked_line)
+                        backup.write(self._mask_sensitive_info(line))
 
             files.append(backup_env_path)
             logger.info(f"設定ファイルバックアップ完了（マスク処理済み): {backup_env_path}")
@@ -258,90 +709,103 @@ class BackupManager:
         if line.strip().startswith("#") or "=" not in line:
             return line
 
-        # キー=値の形式を解析
-        key, value = line.split("=", 1)
-        key = key.strip()
+        # キー=値の形式を解析（前後の空白除去はマスク時のみ）
+        key = line.split("=", 1)[0]
 
-        # 機密情報のキーワードチェック
-        for sensitive_key in self.sensitive_keys:
-            if sensitive_key.upper() in key.upper():
-                return f"{key}=***MASKED***\n"
+        if self._is_sensitive_key(key):
+            return f"{key.strip()}=***MASKED***\n"
 
         return line
 
-    def _backup_pdf_files(self, backup_dir: str) -> List[str]:
+    def _mask_env_match(self, match: "re.Match") -> str:
         """
-        PDFファイルのバックアップ
+        ENV_ASSIGNMENT_RE の一致行をマスク（re.sub 用コールバック）
 
         Args:
-            backup_dir: バックアップ先ディレクトリ
+            match: キー=値 行の一致結果
 
         Returns:
-            List[str]: バックアップされたファイルのリスト
+            str: マスク処理された行（改行を除く）
         """
-        files_dir = os.path.join(backup_dir, "files")
-        os.makedirs(files_dir, exist_ok=True)
-
-        files = []
-
-        if os.path.exists(self.pdf_dir):
-            backup_pdf_dir = os.path.join(files_dir, "pdfs")
-
-            # PDFディレクトリ全体をコピー
-            shutil.copytree(self.pdf_dir, backup_pdf_dir)
+        key = match.group(1)
+        if self._is_sensitive_key(key):
+            return f"{key.strip()}=***MASKED***"
+        return match.group(0)
 
-            # バックアップされたファイルのリストを作成
-            for root, dirs, file_list in os.walk(backup_pdf_dir):
-                for file in file_list:
-                    file_path = os.path.join(root, file)
-                    files.append(file_path)
+    def _is_sensitive_key(self, key: str) -> bool:
+        """
+        設定キーが機密情報のキーワードを含むか判定
 
-            logger.info(f"PDFファイルバックアップ完了: {len(files)} ファイル")
+        Args:
+            key: 設定キー
 
-        return files
+        Returns:
+            bool: 機密情報の場合True
+        """
+        return self._sensitive_re.search(key) is not None
 
-    def _backup_log_files(self, backup_dir: str) -> List[str]:
+    def _backup_pdf_files(self) -> Tuple[List[Tuple[str, str]], List[str]]:
         """
-        重要ログファイルのバックアップ
+        PDFファイルのバックアップ対象を収集
 
-        Args:
-            backup_dir: バックアップ先ディレクトリ
+        PDFは作業ディレクトリへコピーせず、アーカイブ作成時に元ファイルから
+        直接 tar へ追加する（ディスクI/Oと一時領域を削減）。
 
         Returns:
-            List[str]: バックアップされたファイルのリスト
+            Tuple[List[Tuple[str, str]], List[str]]:
+                (アーカイブ追加エントリ (元パス, アーカイブ内パス) のリスト,
+                 バックアップされるPDFファイルのアーカイブ内パスのリスト)
         """
-        logs_backup_dir = os.path.join(backup_dir, "logs")
-        os.makedirs(logs_backup_dir, exist_ok=True)
-
+        entries = []
         files = []
 
-        # app.logのバックアップ
-        app_log_path = os.path.join(self.logs_dir, "app.log")
-        if os.path.exists(app_log_path):
-            backup_app_log = os.path.join(logs_backup_dir, "app.log")
-            shutil.copy2(app_log_path, backup_app_log)
-            files.append(backup_app_log)
+        if os.path.exists(self.pdf_dir):
+            # ディレクトリ自体もエントリに含め、空ディレクトリも復元されるようにする
+            entries.append((self.pdf_dir, "files/pdfs"))
+            for path, rel_path, is_dir in _iter_scandir(self.pdf_dir):
+                arcname = "files/pdfs/" + rel_path
+                entries.append((path, arcname))
+                if not is_dir:
+                    files.append(arcname)
 
-        # emergency_log.txtのバックアップ
-        emergency_log_path = os.path.join(
-            self.instance_dir, "emergency_log.txt"
-        )
-        if os.path.exists(emergency_log_path):
-            backup_emergency_log = os.path.join(
-                logs_backup_dir, "emergency_log.txt"
-            )
-            shutil.copy2(emergency_log_path, backup_emergency_log)
-            files.append(backup_emergency_log)
+            logger.info(f"PDFファイルバックアップ対象: {len(files)} ファイル")
 
-        logger.info(f"ログファイルバックアップ完了: {len(files)} ファイル")
-        return files
+        return entries, files
+
+    def _backup_log_files(self) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """
+        重要ログファイルのバックアップ対象を収集
+
+        ログは作業ディレクトリへコピーせず、アーカイブ作成時に元ファイルから
+        直接 tar へ追加する。
+
+        Returns:
+            Tuple[List[Tuple[str, str]], List[str]]:
+                (アーカイブ追加エントリ (元パス, アーカイブ内パス) のリスト,
+                 バックアップされるログファイルのアーカイブ内パスのリスト)
+        """
+        entries = []
+
+        # app.log と emergency_log.txt のバックアップ
+        for source_path, arcname in (
+            (os.path.join(self.logs_dir, "app.log"), "logs/app.log"),
+            (
+                os.path.join(self.instance_dir, "emergency_log.txt"),
+                "logs/emergency_log.txt",
+            ),
+        ):
+            if os.path.exists(source_path):
+                entries.append((source_path, arcname))
+
+        logger.info(f"ログファイルバックアップ対象: {len(entries)} ファイル")
+        return entries, [arcname for _, arcname in entries]
 
     def _create_metadata(
         self,
         backup_name: str,
         backup_type: str,
         timestamp: str,
-        files: List[str],
+        files_counts: Dict[str, int],
     ) -> Dict:
         """
         バックアップメタデータの作成
@@ -350,7 +814,7 @@ class BackupManager:
             backup_name: バックアップ名
             backup_type: バックアップタイプ
             timestamp: タイムスタンプ
-            files: バックアップされたファイルのリスト
+            files_counts: コンポーネント別のバックアップファイル数
 
         Returns:
             Dict: メタデータ辞書
@@ -360,15 +824,21 @@ class BackupManager:
             "type": backup_type,
             "timestamp": timestamp,
             "created_at": get_app_now().isoformat(),
-            "files_count": len(files),
-            "files": files,
+            "files_count": sum(files_counts.values()),
+            "files_counts": files_counts,
             "version": "1.0",
             "application": "secure-pdf-viewer",
         }
 
     def _create_archive(
-        self, source_dir: str, backup_name: str, backup_type: str = "manual"
-    ) -> str:
+        self,
+        source_dir: str,
+        backup_name: str,
+        backup_type: str = "manual",
+        compresslevel: int = ARCHIVE_COMPRESSION_LEVEL,
+        entries: Optional[List[Tuple[str, str]]] = None,
+        stored_entries: Optional[List[Tuple[str, str]]] = None,
+    ) -> Tuple[str, str]:
         """
         tar.gz アーカイブの作成
 
@@ -376,23 +846,133 @@ class BackupManager:
             source_dir: アーカイブ対象ディレクトリ
             backup_name: バックアップ名
             backup_type: バックアップタイプ
+            compresslevel: gzip圧縮レベル（1-9）
+            entries: 圧縮して追加するファイルの (元パス, アーカイブ内パス) のリスト
+                （ログ等。作業ディレクトリへコピーせず元ファイルから直接追加）
+            stored_entries: 無圧縮で追加する (元パス, アーカイブ内パス) のリスト
+                （PDF等の圧縮済みファイル。ディレクトリは再帰せず単体で追加）
 
         Returns:
-            str: 作成されたアーカイブファイルのパス
+            Tuple[str, str]: (作成されたアーカイブファイルのパス, SHA256チェックサム)
         """
         archive_dir = os.path.join(self.backup_dir, backup_type)
         os.makedirs(archive_dir, exist_ok=True)
 
-        archive_path = os.path.join(archive_dir, f"{backup_name}.tar.gz")
-
-        with tarfile.open(archive_path, "w:gz") as tar:
-            tar.add(source_dir, arcname=backup_name)
+        archive_path = os.path.join(
+            archive_dir, f"{backup_name}{ARCHIVE_EXTENSION}"
+        )
 
-        # セキュアな権限設定
-        os.chmod(archive_path, 0o600)
+        try:
+            # pigz（マルチコア）または gzip コマンドで圧縮
+            checksum = self._write_archive(
+                archive_path,
+                source_dir,
+                backup_name,
+                compresslevel,
+                entries,
+                stored_entries,
+                self._find_compress_command,
+            )
+        except (subprocess.CalledProcessError, BrokenPipeError) as e:
+            logger.warning(
+                f"外部コマンドでの圧縮に失敗、gzip モジュールで再作成: {str(e)}"
+            )
+            checksum = self._write_archive(
+                archive_path,
+                source_dir,
+                backup_name,
+                compresslevel,
+                entries,
+                stored_entries,
+            )
 
         logger.info(f"アーカイブ作成完了: {archive_path}")
-        return archive_path
+        return archive_path, checksum
+
+    def _write_archive(
+        self,
+        archive_path: str,
+        source_dir: str,
+        backup_name: str,
+        compresslevel: int,
+        entries: Optional[List[Tuple[str, str]]] = None,
+        stored_entries: Optional[List[Tuple[str, str]]] = None,
+        compress_command: Optional[Callable[[int], Optional[List[str]]]] = None,
+    ) -> str:
+        """
+        tar.gz アーカイブの書き出し
+
+        Args:
+            archive_path: 出力先アーカイブファイルのパス
+            source_dir: アーカイブ対象ディレクトリ
+            backup_name: バックアップ名
+            compresslevel: gzip圧縮レベル（1-9）
+            entries: 圧縮して追加するファイルの (元パス, アーカイブ内パス) のリスト
+            stored_entries: 無圧縮で追加する (元パス, アーカイブ内パス) のリスト
+            compress_command: 圧縮レベルから外部圧縮コマンドを返す関数
+                （Noneの場合は gzip モジュールで圧縮）
+
+        Returns:
+            str: SHA256チェックサム
+        """
+        with _open_archive_file(archive_path) as f:
+            writer = HashingWriter(f)
+            gz = MultiMemberGzipWriter(writer, compress_command)
+            try:
+                gz.set_compresslevel(compresslevel)
+                # 圧縮レベルをエントリ境界で切り替えるため、非ストリームモード（w）で
+                # tarfile に直接書き込ませる（w| は内部バッファで境界がずれる）
+                with tarfile.open(
+                    fileobj=gz, mode="w", copybufsize=TAR_STREAM_BUFSIZE
+                ) as tar:
+                    # 圧縮対象（DB・設定・メタデータ・ログ）
+                    tar.add(source_dir, arcname=backup_name)
+                    for source_path, arcname in entries or ():
+                        # 先に開いてから情報を取得し、追加中のログローテーションで
+                        # 別ファイルに差し替わっても開いた時点の内容を格納する
+                        with open(source_path, "rb") as src:
+                            tarinfo = tar.gettarinfo(
+                                arcname=f"{backup_name}/{arcname}", fileobj=src
+                            )
+                            tar.addfile(tarinfo, src)
+
+                    # PDFは内部で DEFLATE 圧縮済みのため、再圧縮せず
+                    # 最後にまとめて無圧縮（レベル0）メンバーとして格納
+                    if stored_entries:
+                        gz.set_compresslevel(0)
+                        for source_path, arcname in stored_entries:
+                            tar.add(
+                                source_path,
+                                arcname=f"{backup_name}/{arcname}",
+                                recursive=False,
+                            )
+            finally:
+                gz.close()
+        return writer.checksum
+
+    def _find_compress_command(
+        self, compresslevel: int = ARCHIVE_COMPRESSION_LEVEL
+    ) -> Optional[List[str]]:
+        """
+        アーカイブ圧縮に使用する外部コマンドを検出
+
+        Args:
+            compresslevel: gzip圧縮レベル（1-9）
+
+        Returns:
+            Optional[List[str]]: 圧縮コマンド（pigz > gzip の順で優先、無い場合はNone）
+        """
+        level = f"-{compresslevel}"
+
+        pigz_cmd = shutil.which("pigz")
+        if pigz_cmd:
+            return [pigz_cmd, level, "-p", str(os.cpu_count() or 1)]
+
+        gzip_cmd = shutil.which("gzip")
+        if gzip_cmd:
+            return [gzip_cmd, level]
+
+        return None
 
     def _calculate_checksum(self, file_path: str) -> str:
         """
@@ -404,11 +984,19 @@ class BackupManager:
         Returns:
             str: SHA256チェックサム
         """
-        sha256_hash = hashlib.sha256()
-
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
+        with open(file_path, "rb", buffering=0) as f:
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+: 読み込みループをC側で実行（GIL解放）
+                sha256_hash = hashlib.file_digest(f, _integrity_sha256)
+            else:
+                sha256_hash = _integrity_sha256()
+                buffer = bytearray(CHECKSUM_CHUNK_SIZE)
+                view = memoryview(buffer)
+                while True:
+                    size = f.readinto(buffer)
+                    if not size:
+                        break
+                    sha256_hash.update(view[:size])
 
         return f"sha256:{sha256_hash.hexdigest()}"
 
@@ -420,35 +1008,119 @@ class BackupManager:
             List[Dict]: バックアップ情報のリスト
         """
         backups = []
-        metadata_dir = os.path.join(self.backup_dir, "metadata")
+        cache_key = os.path.abspath(self.backup_dir)
+        metadata_dir = os.path.join(cache_key, "metadata")
 
         if not os.path.exists(metadata_dir):
             return backups
 
-        for filename in os.listdir(metadata_dir):
-            if filename.endswith(".json"):
-                metadata_path = os.path.join(metadata_dir, filename)
+        # メタデータ・アーカイブの各ディレクトリに変更がなければキャッシュを返す
+        signature = self._backup_dirs_signature()
+        with _list_cache_lock:
+            cached_list = _backups_list_cache.get(cache_key)
+            generation = _backups_list_generation.get(cache_key, 0)
+        if (
+            signature is not None
+            and cached_list is not None
+            and cached_list[0] == signature
+        ):
+            return [dict(backup) for backup in cached_list[1]]
+
+        seen_paths = set()
+        with os.scandir(metadata_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+
+                filename = entry.name
+                metadata_path = entry.path
+                seen_paths.add(metadata_path)
                 try:
-                    with open(metadata_path, "r", encoding="utf-8") as f:
-                        metadata = json.load(f)
+                    # 更新日時が変わっていないメタデータはキャッシュから取得
+                    mtime = entry.stat().st_mtime_ns
+                    with _list_cache_lock:
+                        cached = _metadata_cache.get(metadata_path)
+                    if cached is not None and cached[0] == mtime:
+                        metadata = dict(cached[1])
+                    else:
+                        metadata = _load_json_file(metadata_path)
+                        with _list_cache_lock:
+                            _metadata_cache[metadata_path] = (mtime, metadata)
+                        metadata = dict(metadata)
 
                     # バックアップファイルの存在確認
                     backup_name = metadata["backup_name"]
                     backup_file = os.path.join(
-                        self.backup_dir, metadata["type"], f"{backup_name}.tar.gz"
+                        self.backup_dir,
+                        metadata["type"],
+                        f"{backup_name}{ARCHIVE_EXTENSION}",
                     )
 
                     if os.path.exists(backup_file):
                         backups.append(metadata)
 
-                except (json.JSONDecodeError, KeyError) as e:
+                except (ValueError, KeyError, OSError) as e:
                     logger.warning(f"メタデータファイル読み込みエラー {filename}: {str(e)}")
                     continue
 
+        # このディレクトリで削除されたメタデータのキャッシュを破棄
+        with _list_cache_lock:
+            for cached_path in [
+                path
+                for path in _metadata_cache
+                if os.path.dirname(path) == metadata_dir and path not in seen_paths
+            ]:
+                del _metadata_cache[cached_path]
+
         # 作成日時でソート（新しい順）
         backups.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+
+        # 直近に更新されたディレクトリがある場合は後続の変更を検知できないため保存しない
+        cacheable = (
+            signature is not None
+            and time.time_ns() - max(signature) > LIST_CACHE_RACY_WINDOW_NS
+        )
+        with _list_cache_lock:
+            # 走査中に他スレッドがキャッシュを破棄した、またはディレクトリが
+            # 更新された場合は、走査結果が古い可能性があるため保存しない
+            if (
+                cacheable
+                and _backups_list_generation.get(cache_key, 0) == generation
+                and self._backup_dirs_signature() == signature
+            ):
+                _backups_list_cache[cache_key] = (
+                    signature, [dict(backup) for backup in backups]
+                )
+            else:
+                _backups_list_cache.pop(cache_key, None)
+
         return backups
 
+    def _invalidate_backups_cache(self):
+        """このバックアップディレクトリの一覧キャッシュを破棄"""
+        cache_key = os.path.abspath(self.backup_dir)
+        with _list_cache_lock:
+            _backups_list_cache.pop(cache_key, None)
+            _backups_list_generation[cache_key] = (
+                _backups_list_generation.get(cache_key, 0) + 1
+            )
+
+    def _backup_dirs_signature(self) -> Optional[Tuple[int, ...]]:
+        """
+        バックアップ一覧キャッシュの有効性判定用に各ディレクトリの更新日時を取得
+
+        Returns:
+            Optional[Tuple[int, ...]]: メタデータ・各タイプ別ディレクトリの mtime_ns
+                （取得できない場合はNone）
+        """
+        try:
+            return tuple(
+                os.stat(os.path.join(self.backup_dir, name)).st_mtime_ns
+                for name in ("metadata",) + BACKUP_TYPES
+            )
+        except OSError:
+            return None
+
     def delete_backup(self, backup_name: str) -> bool:
         """
         バックアップファイルの削除
@@ -472,21 +1144,15 @@ class BackupManager:
                 logger.warning(f"メタデータファイルが見つかりません: {backup_name}")
                 return False
 
-            with open(metadata_file, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
-
-            backup_type = metadata.get("type", "manual")
-
             # バックアップファイル削除
-            backup_file = os.path.join(
-                self.backup_dir, backup_type, f"{backup_name}.tar.gz"
-            )
-            if os.path.exists(backup_file):
+            backup_file = self._find_backup_file(backup_name, metadata_file)
+            if backup_file:
                 os.remove(backup_file)
                 logger.info(f"バックアップファイル削除: {backup_file}")
 
             # メタデータファイル削除
             os.remove(metadata_file)
+            self._invalidate_backups_cache()
             logger.info(f"メタデータファイル削除: {metadata_file}")
 
             return True
@@ -495,6 +1161,53 @@ class BackupManager:
             logger.error(f"バックアップ削除エラー {backup_name}: {str(e)}")
             return False
 
+    def _delete_backup_fast(self, metadata: Dict) -> bool:
+        """
+        取得済みのメタデータを使ったバックアップ削除（世代管理用）
+
+        list_backups の結果からタイプが分かっているため、
+        メタデータファイルの再読み込みや保存先の探索を行わない。
+
+        Args:
+            metadata: list_backups で取得したバックアップのメタデータ
+
+        Returns:
+            bool: 削除成功の可否
+        """
+        backup_name = metadata.get("backup_name", "")
+        backup_type = metadata.get("type")
+
+        # Path Traversal対策（メタデータの内容もパスに使用するため検証する）
+        if (
+            not self._is_safe_backup_name(backup_name)
+            or backup_type not in BACKUP_TYPES
+        ):
+            logger.warning(f"不正なバックアップメタデータのため削除をスキップ: {backup_name}")
+            return False
+
+        backup_file = os.path.join(
+            self.backup_dir, backup_type, f"{backup_name}{ARCHIVE_EXTENSION}"
+        )
+        metadata_file = os.path.join(
+            self.backup_dir, "metadata", f"{backup_name}.json"
+        )
+
+        try:
+            try:
+                os.remove(backup_file)
+                logger.info(f"バックアップファイル削除: {backup_file}")
+            except FileNotFoundError:
+                pass
+
+            os.remove(metadata_file)
+            self._invalidate_backups_cache()
+            logger.info(f"メタデータファイル削除: {metadata_file}")
+            return True
+
+        except OSError as e:
+            logger.error(f"バックアップ削除エラー {backup_name}: {str(e)}")
+            return False
+
     def get_backup_path(self, backup_name: str) -> Optional[str]:
         """
         バックアップファイルのパスを取得（ダウンロード用）
@@ -516,19 +1229,37 @@ class BackupManager:
         if not os.path.exists(metadata_file):
             return None
 
-        try:
-            with open(metadata_file, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
+        return self._find_backup_file(backup_name, metadata_file)
+
+    def _find_backup_file(self, backup_name: str, metadata_file: str) -> Optional[str]:
+        """
+        バックアップファイルのパスを探索
+
+        バックアップタイプごとの保存先を直接確認し、
+        見つからない場合のみメタデータを読み込んでタイプを取得する。
+
+        Args:
+            backup_name: バックアップ名
+            metadata_file: メタデータファイルのパス
+
+        Returns:
+            Optional[str]: バックアップファイルのパス（存在しない場合はNone）
+        """
+        archive_name = f"{backup_name}{ARCHIVE_EXTENSION}"
+        for backup_type in BACKUP_TYPES:
+            backup_file = os.path.join(self.backup_dir, backup_type, archive_name)
+            if os.path.exists(backup_file):
+                return backup_file
 
+        try:
+            metadata = _load_json_file(metadata_file)
             backup_type = metadata.get("type", "manual")
-            backup_file = os.path.join(
-                self.backup_dir, backup_type, f"{backup_name}.tar.gz"
-            )
+            backup_file = os.path.join(self.backup_dir, backup_type, archive_name)
 
             if os.path.exists(backup_file):
                 return backup_file
 
-        except (json.JSONDecodeError, KeyError):
+        except (ValueError, OSError):
             logger.warning(f"メタデータファイル読み込みエラー: {backup_name}")
 
         return None
@@ -543,23 +1274,9 @@ class BackupManager:
         Returns:
             bool: 安全性の可否
         """
-        # 危険な文字列パターンをチェック
-        dangerous_patterns = ["..", "/", "\\", ":", "*", "?", '"', "<", ">", "|"]
-
-        for pattern in dangerous_patterns:
-            if pattern in backup_name:
-                return False
-
-        # 正規表現での形式チェック
-        # backup_YYYYMMDD_HHMMSS形式 または pre_restore_YYYYMMDD_HHMMSS形式
-        backup_pattern = r"^backup_\d{8}_\d{6}$"
-        pre_restore_pattern = r"^pre_restore_\d{8}_\d{6}$"
-        
-        if not (re.match(backup_pattern, backup_name) or 
-                re.match(pre_restore_pattern, backup_name)):
-            return False
-
-        return True
+        # backup_YYYYMMDD_HHMMSS形式 または pre_restore_YYYYMMDD_HHMMSS形式のみ許可
+        # （英数字と "_" 以外を含む名前は完全一致しないため、危険文字の個別チェックは不要）
+        return SAFE_BACKUP_NAME_RE.fullmatch(backup_name) is not None
 
     # ===== Phase 2: 定期バックアップ・世代管理機能 =====
 
@@ -576,19 +1293,20 @@ class BackupManager:
             "retention_days": 30,
             "backup_time": "02:00",  # HH:MM形式
             "max_backup_size": 1024,  # MB
+            "compression_level": ARCHIVE_COMPRESSION_LEVEL,  # gzip 1-9
+            "db_backup_pages": DB_BACKUP_PAGES_PER_STEP,  # -1 で一括コピー
         }
 
         if not os.path.exists(self.settings_file):
             return default_settings
 
         try:
-            with open(self.settings_file, "r", encoding="utf-8") as f:
-                settings = json.load(f)
-                # デフォルト値で不足分を補完
-                for key, default_value in default_settings.items():
-                    if key not in settings:
-                        settings[key] = default_value
-                return settings
+            settings = _load_json_file(self.settings_file)
+            # デフォルト値で不足分を補完
+            for key, default_value in default_settings.items():
+                if key not in settings:
+                    settings[key] = default_value
+            return settings
         except (json.JSONDecodeError, FileNotFoundError) as e:
             logger.warning(f"設定ファイル読み込みエラー: {str(e)}")
             return default_settings
@@ -627,13 +1345,20 @@ class BackupManager:
                     not isinstance(value, int) or value < 1
                 ):
                     raise ValueError(f"不正な最大バックアップサイズ: {value}")
+                elif key == "compression_level" and (
+                    not isinstance(value, int) or not 1 <= value <= 9
+                ):
+                    raise ValueError(f"不正な圧縮レベル: {value}")
+                elif key == "db_backup_pages" and (
+                    not isinstance(value, int) or (value < 1 and value != -1)
+                ):
+                    raise ValueError(f"不正なDBバックアップページ数: {value}")
 
             # 設定更新
             current_settings.update(new_settings)
 
             # ファイル保存
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(current_settings, f, indent=2, ensure_ascii=False)
+            _dump_json_file(self.settings_file, current_settings, pretty=True)
 
             logger.info(f"バックアップ設定更新完了: {new_settings}")
             return True
@@ -671,7 +1396,7 @@ class BackupManager:
                     backups_to_delete = backups_sorted[:-max_backups]
 
                     for backup in backups_to_delete:
-                        if self.delete_backup(backup["backup_name"]):
+                        if self._delete_backup_fast(backup):
                             deleted_count += 1
             else:
                 # 保持日数による削除
@@ -680,10 +1405,9 @@ class BackupManager:
 
                 for backup in backups:
                     try:
-                        created_at = datetime.fromisoformat(backup["created_at"])
-                        created_at = to_app_timezone(created_at)
+                        created_at = _parse_created_at(backup["created_at"])
                         if created_at < cutoff_date:
-                            if self.delete_backup(backup["backup_name"]):
+                            if self._delete_backup_fast(backup):
                                 deleted_count += 1
                     except (ValueError, KeyError):
                         logger.warning(
@@ -778,8 +1502,7 @@ class BackupManager:
                 latest_auto_backup = max(
                     auto_backups, key=lambda x: x.get("created_at", "")
                 )
-                latest_time = datetime.fromisoformat(latest_auto_backup["created_at"])
-                latest_time = to_app_timezone(latest_time)
+                latest_time = _parse_created_at(latest_auto_backup["created_at"])
 
                 if settings["backup_interval"] == "daily":
                     min_interval = timedelta(days=1)
@@ -819,18 +1542,30 @@ class BackupManager:
                     "oldest_backup": None,
                 }
 
-            manual_backups = [b for b in backups if b.get("type") == "manual"]
-            auto_backups = [b for b in backups if b.get("type") == "auto"]
-            total_size = sum(b.get("size", 0) for b in backups)
-
-            # 最新・最古のバックアップ
-            latest_backup = max(backups, key=lambda x: x.get("created_at", ""))
-            oldest_backup = min(backups, key=lambda x: x.get("created_at", ""))
+            # 件数・合計サイズ・最新／最古のバックアップを1回の走査で集計
+            manual_count = 0
+            auto_count = 0
+            total_size = 0
+            latest_backup = oldest_backup = backups[0]
+            latest_created_at = oldest_created_at = backups[0].get("created_at", "")
+            for backup in backups:
+                backup_type = backup.get("type")
+                if backup_type == "manual":
+                    manual_count += 1
+                elif backup_type == "auto":
+                    auto_count += 1
+                total_size += backup.get("size", 0)
+
+                created_at = backup.get("created_at", "")
+                if created_at > latest_created_at:
+                    latest_backup, latest_created_at = backup, created_at
+                if created_at < oldest_created_at:
+                    oldest_backup, oldest_created_at = backup, created_at
 
             return {
                 "total_backups": len(backups),
-                "manual_backups": len(manual_backups),
-                "auto_backups": len(auto_backups),
+                "manual_backups": manual_count,
+                "auto_backups": auto_count,
                 "total_size": total_size,
                 "latest_backup": latest_backup,
                 "oldest_backup": oldest_backup,
@@ -946,9 +1681,16 @@ class BackupManager:
             if old_path:
                 # 新しいパスを直接構築
                 new_path = os.path.join(
-                    self.backup_dir, "pre_restore", f"{pre_restore_name}.tar.gz"
+                    self.backup_dir,
+                    "pre_restore",
+                    f"{pre_restore_name}{ARCHIVE_EXTENSION}",
                 )
-                shutil.copy2(old_path, new_path)
+                # 同一ファイルシステム上ではハードリンクで共有し、アーカイブ全体の
+                # 再読み込み・再書き込みを避ける（チェックサムもそのまま流用できる）
+                try:
+                    os.link(old_path, new_path)
+                except OSError:
+                    shutil.copy2(old_path, new_path)
 
                 # メタデータも更新
                 old_metadata_path = os.path.join(
@@ -962,12 +1704,11 @@ class BackupManager:
                     shutil.copy2(old_metadata_path, new_metadata_path)
 
                     # メタデータ内容も更新
-                    with open(new_metadata_path, "r") as f:
-                        metadata = json.load(f)
+                    metadata = _load_json_file(new_metadata_path)
                     metadata["backup_name"] = pre_restore_name
                     metadata["type"] = "pre_restore"
-                    with open(new_metadata_path, "w") as f:
-                        json.dump(metadata, f, indent=2, ensure_ascii=False)
+                    _dump_json_file(new_metadata_path, metadata)
+                    self._invalidate_backups_cache()
 
             logger.info(f"復旧前セーフティネット作成完了: {pre_restore_name}")
             return pre_restore_name
@@ -1012,7 +1753,7 @@ class BackupManager:
         """
         try:
             # tarファイルとして正常に開けるかチェック
-            with tarfile.open(backup_path, "r:gz") as tar:
+            with tarfile.open(backup_path, ARCHIVE_READ_MODE) as tar:
                 # 必須ファイルの存在確認
                 required_files = [
                     "database/database.db",
@@ -1052,7 +1793,7 @@ class BackupManager:
                     f.write(f"アーカイブ展開開始: {backup_path}\n")
 
                 # tar.gz展開
-                with tarfile.open(backup_path, "r:gz") as tar:
+                with tarfile.open(backup_path, ARCHIVE_READ_MODE) as tar:
                     tar.extractall(temp_dir)
 
                 # 展開されたディレクトリを確認
@@ -1153,9 +1894,8 @@ class BackupManager:
                 shutil.copytree(source_pdf_dir, self.pdf_dir)
                 
                 # ファイル権限設定
-                for root, dirs, files in os.walk(self.pdf_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
+                for file_path, _, is_dir in _iter_scandir(self.pdf_dir):
+                    if not is_dir:
                         os.chmod(file_path, 0o644)
             else:
                 # ソースディレクトリが存在しない場合は空のディレクトリを作成
@@ -1,8 +1,39 @@
 """
 データベースマイグレーション管理
 """
+import logging
 import sqlite3
-import re
+import string
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# パスフレーズの文字数制限
+_PASSPHRASE_MIN_LENGTH = 32
+_PASSPHRASE_MAX_LENGTH = 128
+
+# パスフレーズに許可する文字（ASCII: 0-9, a-z, A-Z, _, -）
+_ALLOWED_PASSPHRASE_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
+# マイグレーション実行中のみ適用する接続単位の PRAGMA
+# （journal_mode=WAL と synchronous=NORMAL は init_db / get_db_connection で設定済み）
+_MIGRATION_PRAGMAS = (
+    ("temp_store", 2),  # MEMORY: インデックス作成時の一時ソートをメモリ上で行う
+    ("cache_size", -64000),  # 約64MBのページキャッシュ
+    ("busy_timeout", 30000),  # BEGIN IMMEDIATE のロック待ちを SQLite 内で最大30秒再試行
+)
+
+# 移行元パスワードが無効・未設定の場合に使用するデフォルトパスフレーズ
+_DEFAULT_PASSPHRASE = "default_passphrase_32chars_minimum_length_example"
+
+# shared_passphrase 設定の説明
+_PASSPHRASE_DESCRIPTION = "事前共有パスフレーズ（32-128文字、0-9a-zA-Z_-のみ）"
+
+# shared_passphrase 設定の登録SQL（移行・デフォルト作成の両分岐で共用）
+_INSERT_PASSPHRASE_SQL = """
+    INSERT OR REPLACE INTO settings (key, value, value_type, description, category, is_sensitive)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
 
 
 def validate_passphrase(passphrase):
@@ -14,42 +45,54 @@ def validate_passphrase(passphrase):
     if not passphrase:
         return False, "パスフレーズが空です"
 
-    # 文字数チェック
-    if len(passphrase) < 32:
+    # 文字数チェック（文字種チェックより先に安価な判定を行う）
+    length = len(passphrase)
+    if length < _PASSPHRASE_MIN_LENGTH:
         return False, "パスフレーズは32文字以上である必要があります"
 
-    if len(passphrase) > 128:
+    if length > _PASSPHRASE_MAX_LENGTH:
         return False, "パスフレーズは128文字以下である必要があります"
 
     # 文字種チェック（ASCII: 0-9, a-z, A-Z, _, -）
-    allowed_pattern = re.compile(r"^[0-9a-zA-Z_-]+$")
-    if not allowed_pattern.match(passphrase):
+    # 正規表現より isascii と集合比較の方が短い文字列では高速
+    if not (
+        passphrase.isascii() and _ALLOWED_PASSPHRASE_CHARS.issuperset(passphrase)
+    ):
         return False, "パスフレーズは0-9, a-z, A-Z, _, - の文字のみ使用可能です"
 
     return True, "有効なパスフレーズです"
 
 
+def _get_table_columns(db, table_name):
+    """
+    テーブルの既存カラム名を取得（テーブルが存在しない場合は空集合）
+
+    ALTER TABLE の失敗（duplicate column name）に頼らずに
+    カラム追加の要否を判定するために使用する
+    """
+    return {row[1] for row in db.execute(f"PRAGMA table_info({table_name})")}
+
+
 def migrate_password_to_passphrase(db):
     """
     shared_password を shared_passphrase に移行
     """
-    # shared_passphraseが既に存在するかチェック
-    db.row_factory = sqlite3.Row
-    existing_passphrase = db.execute(
-        "SELECT value FROM settings WHERE key = ?", ("shared_passphrase",)
-    ).fetchone()
+    # shared_passphrase と shared_password を1回のクエリで取得
+    current_settings = dict(
+        db.execute(
+            "SELECT key, value FROM settings WHERE key IN (?, ?)",
+            ("shared_passphrase", "shared_password"),
+        ).fetchall()
+    )
 
-    if existing_passphrase:
-        print(f"shared_passphrase already exists, skipping migration")
+    # shared_passphraseが既に存在するかチェック
+    if "shared_passphrase" in current_settings:
+        logger.info("shared_passphrase already exists, skipping migration")
         return True
 
-    # 現在の shared_password 設定を取得
-    current_setting = db.execute(
-        "SELECT value FROM settings WHERE key = ?", ("shared_password",)
-    ).fetchone()
-
-    if current_setting:
-        current_password = current_setting["value"]
+    # 現在の shared_password 設定を確認
+    if "shared_password" in current_settings:
+        current_password = current_settings["shared_password"]
 
         # 現在のパスワードがパスフレーズ要件を満たしているかチェック
         is_valid, message = validate_passphrase(current_password)
@@ -59,21 +102,19 @@ def migrate_password_to_passphrase(db):
             new_passphrase = current_password
         else:
             # 無効な場合はデフォルトのパスフレーズを使用
-            new_passphrase = "default_passphrase_32chars_minimum_length_example"
-            print(f"現在のパスワード '{current_password}' は無効です: {message}")
-            print(f"デフォルトパスフレーズ '{new_passphrase}' を使用します")
+            new_passphrase = _DEFAULT_PASSPHRASE
+            # パスワード・パスフレーズの値はログに出力しない
+            logger.warning(f"現在のパスワードは無効です: {message}")
+            logger.warning("デフォルトパスフレーズを使用します")
 
         # 新しい shared_passphrase 設定を作成
         db.execute(
-            """
-            INSERT OR REPLACE INTO settings (key, value, value_type, description, category, is_sensitive)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
+            _INSERT_PASSPHRASE_SQL,
             (
                 "shared_passphrase",
                 new_passphrase,
                 "string",
-                "事前共有パスフレーズ（32-128文字、0-9a-zA-Z_-のみ）",
+                _PASSPHRASE_DESCRIPTION,
                 "auth",
                 True,
             ),
@@ -97,28 +138,25 @@ def migrate_password_to_passphrase(db):
             ),
         )
 
-        print(f"Migration completed: shared_password -> shared_passphrase")
+        logger.info("Migration completed: shared_password -> shared_passphrase")
         return True
 
     else:
         # shared_password が存在しない場合、デフォルトのパスフレーズを作成
-        default_passphrase = "default_passphrase_32chars_minimum_length_example"
+        default_passphrase = _DEFAULT_PASSPHRASE
         db.execute(
-            """
-            INSERT OR REPLACE INTO settings (key, value, value_type, description, category, is_sensitive)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
+            _INSERT_PASSPHRASE_SQL,
             (
                 "shared_passphrase",
                 default_passphrase,
                 "string",
-                "事前共有パスフレーズ（32-128文字、0-9a-zA-Z_-のみ）",
+                _PASSPHRASE_DESCRIPTION,
                 "auth",
                 True,
             ),
         )
 
-        print(f"Created default passphrase setting: {default_passphrase}")
+        logger.info("Created default passphrase setting")
         return True
 
 
@@ -126,11 +164,11 @@ def run_migration_001(db):
     """
     Migration 001: パスワードからパスフレーズへの移行
     """
-    print("Running Migration 001: Password to Passphrase")
+    logger.info("Running Migration 001: Password to Passphrase")
 
     try:
-        # トランザクション開始
-        db.execute("BEGIN TRANSACTION")
+        # トランザクション開始（書き込みロックを先に確保する）
+        db.execute("BEGIN IMMEDIATE TRANSACTION")
 
         # マイグレーション実行
         migrate_password_to_passphrase(db)
@@ -150,8 +188,9 @@ def run_migration_001(db):
         # マイグレーション実行記録
         db.execute(
             """
-            INSERT OR REPLACE INTO migrations (name, description)
+            INSERT INTO migrations (name, description)
             VALUES (?, ?)
+            ON CONFLICT(name) DO NOTHING
         """,
             (
                 "001_password_to_passphrase",
@@ -161,118 +200,151 @@ def run_migration_001(db):
 
         # コミット
         db.execute("COMMIT")
-        print("Migration 001 completed successfully")
+        logger.info("Migration 001 completed successfully")
 
     except Exception as e:
-        # ロールバック
-        db.execute("ROLLBACK")
-        print(f"Migration 001 failed: {str(e)}")
+        # ロールバック（BEGIN IMMEDIATE 自体がロック待ちで失敗した場合は
+        # トランザクションが開始されていないため、元の例外を優先する）
+        if db.in_transaction:
+            db.execute("ROLLBACK")
+        logger.error(f"Migration 001 failed: {str(e)}")
         raise
 
 
-def run_migration_002(db):
+# Migration 002: access_logs テーブルに追加するカラム
+_ACCESS_LOGS_COLUMNS_002 = (
+    ("user_email", "TEXT"),
+    ("duration_seconds", "INTEGER"),
+    ("pdf_file_path", "TEXT"),
+)
+
+# Migration 002: security_events テーブルのDDL
+_SCHEMA_002 = """
+CREATE TABLE IF NOT EXISTS security_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_email TEXT NOT NULL,
+    event_type TEXT NOT NULL CHECK (event_type IN (
+        'pdf_view', 'download_attempt', 'print_attempt', 
+        'direct_access', 'devtools_open', 'unauthorized_action', 
+        'page_leave', 'screenshot_attempt', 'copy_attempt'
+    )),
+    event_details JSON,
+    risk_level TEXT NOT NULL CHECK (risk_level IN ('low', 'medium', 'high')) DEFAULT 'low',
+    ip_address TEXT,
+    user_agent TEXT,
+    occurred_at TEXT,
+    pdf_file_path TEXT,
+    session_id TEXT
+);
+"""
+
+# Migration 002: security_events テーブルのインデックス
+_INDEXES_002 = """
+CREATE INDEX IF NOT EXISTS idx_security_events_user_email ON security_events(user_email);
+CREATE INDEX IF NOT EXISTS idx_security_events_event_type ON security_events(event_type);
+CREATE INDEX IF NOT EXISTS idx_security_events_risk_level ON security_events(risk_level);
+CREATE INDEX IF NOT EXISTS idx_security_events_time_cover ON security_events(occurred_at, risk_level, event_type);
+CREATE INDEX IF NOT EXISTS idx_security_events_pdf_file_path ON security_events(pdf_file_path);
+CREATE INDEX IF NOT EXISTS idx_security_events_session_id ON security_events(session_id);
+"""
+
+# Migration 002: access_logs テーブルが存在する場合のみ作成するインデックス
+_ACCESS_LOGS_INDEXES_002 = """
+CREATE INDEX IF NOT EXISTS idx_access_logs_user_email ON access_logs(user_email);
+CREATE INDEX IF NOT EXISTS idx_access_logs_pdf_file_path ON access_logs(pdf_file_path);
+"""
+
+
+def _build_schema_002(access_logs_columns):
     """
-    Migration 002: セキュリティイベントログ機能追加
+    Migration 002 のスキーマ変更（カラム追加・テーブル作成）のSQLを組み立てる
+
+    Args:
+        access_logs_columns: access_logs の既存カラム名（空集合ならテーブル未作成）
+
+    Returns:
+        tuple: (SQL文のリスト, 追加するカラム名のリスト)
     """
-    print("Running Migration 002: Security Event Logging")
+    statements = []
+    added_columns = []
+
+    if access_logs_columns:
+        # access_logs テーブルに不足しているカラムのみ追加
+        for column, column_type in _ACCESS_LOGS_COLUMNS_002:
+            if column in access_logs_columns:
+                logger.info(f"{column} column already exists in access_logs")
+                continue
+            statements.append(
+                f"ALTER TABLE access_logs ADD COLUMN {column} {column_type};"
+            )
+            added_columns.append(column)
+    else:
+        logger.info("access_logs table does not exist, skipping column additions")
 
-    try:
-        # トランザクション開始
-        db.execute("BEGIN TRANSACTION")
+    statements.append(_SCHEMA_002)
+    return statements, added_columns
 
-        # access_logs テーブルの存在を確認
-        table_exists = db.execute(
-            """
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='access_logs'
-        """
-        ).fetchone()
 
-        if table_exists:
-            # access_logs テーブルに新しいカラムを追加
-            try:
-                db.execute("ALTER TABLE access_logs ADD COLUMN user_email TEXT")
-                print("Added user_email column to access_logs")
-            except sqlite3.OperationalError as e:
-                if "duplicate column name" not in str(e).lower():
-                    raise
-                print("user_email column already exists in access_logs")
-
-            try:
-                db.execute(
-                    "ALTER TABLE access_logs ADD COLUMN duration_seconds INTEGER"
-                )
-                print("Added duration_seconds column to access_logs")
-            except sqlite3.OperationalError as e:
-                if "duplicate column name" not in str(e).lower():
-                    raise
-                print("duration_seconds column already exists in access_logs")
-
-            try:
-                db.execute("ALTER TABLE access_logs ADD COLUMN pdf_file_path TEXT")
-                print("Added pdf_file_path column to access_logs")
-            except sqlite3.OperationalError as e:
-                if "duplicate column name" not in str(e).lower():
-                    raise
-                print("pdf_file_path column already exists in access_logs")
-        else:
-            print("access_logs table does not exist, skipping column additions")
+def _build_indexes_002(access_logs_exists):
+    """
+    Migration 002 のインデックス作成SQLを組み立てる
 
-        # security_events テーブルを作成
-        db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS security_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_email TEXT NOT NULL,
-                event_type TEXT NOT NULL CHECK (event_type IN (
-                    'pdf_view', 'download_attempt', 'print_attempt', 
-                    'direct_access', 'devtools_open', 'unauthorized_action', 
-                    'page_leave', 'screenshot_attempt', 'copy_attempt'
-                )),
-                event_details JSON,
-                risk_level TEXT NOT NULL CHECK (risk_level IN ('low', 'medium', 'high')) DEFAULT 'low',
-                ip_address TEXT,
-                user_agent TEXT,
-                occurred_at TEXT,
-                pdf_file_path TEXT,
-                session_id TEXT
-            )
-        """
-        )
-        print("Created security_events table")
+    Args:
+        access_logs_exists: access_logs テーブルが存在するか
 
-        # インデックス作成
-        security_indexes = [
-            "CREATE INDEX IF NOT EXISTS idx_security_events_user_email ON security_events(user_email)",
-            "CREATE INDEX IF NOT EXISTS idx_security_events_event_type ON security_events(event_type)",
-            "CREATE INDEX IF NOT EXISTS idx_security_events_risk_level ON security_events(risk_level)",
-            "CREATE INDEX IF NOT EXISTS idx_security_events_occurred_at ON security_events(occurred_at)",
-            "CREATE INDEX IF NOT EXISTS idx_security_events_pdf_file_path ON security_events(pdf_file_path)",
-            "CREATE INDEX IF NOT EXISTS idx_security_events_session_id ON security_events(session_id)",
-        ]
+    Returns:
+        list: SQL文のリスト
+    """
+    statements = [_INDEXES_002]
+    if access_logs_exists:
+        statements.append(_ACCESS_LOGS_INDEXES_002)
+    return statements
 
-        for index_sql in security_indexes:
-            db.execute(index_sql)
-        print("Created security event indexes")
 
-        # access_logsテーブルが存在する場合のみインデックス作成
+def run_migration_002(db):
+    """
+    Migration 002: セキュリティイベントログ機能追加
+
+    スキーマ変更 → （データ投入） → インデックス作成 の順で実行する。
+    データ投入を追加する場合はインデックス作成より前に行い、
+    投入中のインデックス更新を避けること。
+    """
+    logger.info("Running Migration 002: Security Event Logging")
+
+    try:
+        # access_logs テーブルの既存カラムを取得（空集合ならテーブル未作成）
+        access_logs_columns = _get_table_columns(db, "access_logs")
+        table_exists = bool(access_logs_columns)
+
+        schema_statements, added_columns = _build_schema_002(access_logs_columns)
+
+        # executescript は保留中のトランザクションを先に COMMIT するため、
+        # BEGIN をスクリプト先頭に含めて DDL 全体を1回の呼び出しで実行する
+        db.executescript(
+            "\n".join(
+                [
+                    "BEGIN IMMEDIATE TRANSACTION;",
+                    *schema_statements,
+                    *_build_indexes_002(table_exists),
+                ]
+            )
+        )
+
+        for column in added_columns:
+            logger.info(f"Added {column} column to access_logs")
+        logger.info("Created security_events table")
+        logger.info("Created security event indexes")
         if table_exists:
-            access_logs_indexes = [
-                "CREATE INDEX IF NOT EXISTS idx_access_logs_user_email ON access_logs(user_email)",
-                "CREATE INDEX IF NOT EXISTS idx_access_logs_pdf_file_path ON access_logs(pdf_file_path)",
-            ]
-
-            for index_sql in access_logs_indexes:
-                db.execute(index_sql)
-            print("Created access_logs indexes")
+            logger.info("Created access_logs indexes")
         else:
-            print("access_logs table does not exist, skipping access_logs indexes")
+            logger.info("access_logs table does not exist, skipping access_logs indexes")
 
         # マイグレーション実行記録
         db.execute(
             """
-            INSERT OR REPLACE INTO migrations (name, description)
+            INSERT INTO migrations (name, description)
             VALUES (?, ?)
+            ON CONFLICT(name) DO NOTHING
         """,
             (
                 "002_security_event_logging",
@@ -282,59 +354,62 @@ def run_migration_002(db):
 
         # コミット
         db.execute("COMMIT")
-        print("Migration 002 completed successfully")
+        logger.info("Migration 002 completed successfully")
 
     except Exception as e:
-        # ロールバック
-        db.execute("ROLLBACK")
-        print(f"Migration 002 failed: {str(e)}")
+        # ロールバック（BEGIN IMMEDIATE 自体がロック待ちで失敗した場合は
+        # トランザクションが開始されていないため、元の例外を優先する）
+        if db.in_transaction:
+            db.execute("ROLLBACK")
+        logger.error(f"Migration 002 failed: {str(e)}")
         raise
 
 
 def get_applied_migrations(db):
-    """適用済みマイグレーションを取得"""
+    """適用済みマイグレーション名の集合を取得（メンバーシップ判定用のため順序なし）"""
     try:
-        db.row_factory = sqlite3.Row
-        return [
-            row["name"]
-            for row in db.execute(
-                "SELECT name FROM migrations ORDER BY applied_at"
-            ).fetchall()
-        ]
+        return {row[0] for row in db.execute("SELECT name FROM migrations")}
     except sqlite3.OperationalError:
         # migrationsテーブルが存在しない場合
-        return []
+        return set()
 
 
 def run_migration_003(db):
     """マイグレーション003: PDFテーブルのカラム追加"""
-    print("Starting migration 003: Adding PDF table columns")
+    logger.info("Starting migration 003: Adding PDF table columns")
+
+    # published_date と unpublished_date のうち不足しているカラムを確認
+    pdf_files_columns = _get_table_columns(db, "pdf_files")
+    missing_columns = []
+    for column in ("published_date", "unpublished_date"):
+        if column in pdf_files_columns:
+            logger.info(f"{column} column already exists")
+        else:
+            missing_columns.append(column)
 
     try:
-        # published_date と unpublished_date カラムを追加
-        try:
-            db.execute("ALTER TABLE pdf_files ADD COLUMN published_date TEXT")
-            print("Added published_date column to pdf_files table")
-        except Exception as e:
-            if "duplicate column name" in str(e).lower():
-                print("published_date column already exists")
-            else:
-                raise e
-
-        try:
-            db.execute("ALTER TABLE pdf_files ADD COLUMN unpublished_date TEXT")
-            print("Added unpublished_date column to pdf_files table")
-        except Exception as e:
-            if "duplicate column name" in str(e).lower():
-                print("unpublished_date column already exists")
-            else:
-                raise e
+        # トランザクション開始（書き込みロックを先に確保する）と
+        # カラム追加を1回の executescript で実行する
+        db.executescript(
+            "\n".join(
+                [
+                    "BEGIN IMMEDIATE TRANSACTION;",
+                    *(
+                        f"ALTER TABLE pdf_files ADD COLUMN {column} TEXT;"
+                        for column in missing_columns
+                    ),
+                ]
+            )
+        )
+        for column in missing_columns:
+            logger.info(f"Added {column} column to pdf_files table")
 
         # マイグレーション実行記録
         db.execute(
             """
-            INSERT OR REPLACE INTO migrations (name, description)
+            INSERT INTO migrations (name, description)
             VALUES (?, ?)
+            ON CONFLICT(name) DO NOTHING
         """,
             (
                 "003_pdf_table_columns",
@@ -342,28 +417,32 @@ def run_migration_003(db):
             ),
         )
 
-        print("Migration 003 completed successfully")
+        # コミット
+        db.execute("COMMIT")
+        logger.info("Migration 003 completed successfully")
 
     except Exception as e:
-        print(f"Migration 003 failed: {e}")
+        # ロールバック（BEGIN IMMEDIATE 自体がロック待ちで失敗した場合は
+        # トランザクションが開始されていないため、元の例外を優先する）
+        if db.in_transaction:
+            db.execute("ROLLBACK")
+        logger.error(f"Migration 003 failed: {e}")
         raise
 
 
 def run_migration_004(db):
     """マイグレーション004: 管理者ロール体系とセッション管理強化"""
-    print("Running Migration 004: Admin Role System and Session Management Enhancement")
+    logger.info("Running Migration 004: Admin Role System and Session Management Enhancement")
 
     try:
         # 既にトランザクション内のため、BEGIN TRANSACTIONは不要
 
         # admin_usersテーブルにroleカラムを追加
-        try:
+        if "role" in _get_table_columns(db, "admin_users"):
+            logger.info("role column already exists in admin_users")
+        else:
             db.execute('ALTER TABLE admin_users ADD COLUMN role TEXT DEFAULT "admin"')
-            print("Added role column to admin_users table")
-        except sqlite3.OperationalError as e:
-            if "duplicate column name" not in str(e).lower():
-                raise
-            print("role column already exists in admin_users")
+            logger.info("Added role column to admin_users table")
 
         # 既存の最初の管理者をsuper_adminに設定
         db.execute(
@@ -373,7 +452,7 @@ def run_migration_004(db):
             WHERE id = (SELECT MIN(id) FROM admin_users WHERE is_active = TRUE)
         """
         )
-        print("Set first admin as super_admin")
+        logger.info("Set first admin as super_admin")
 
         # 管理者セッション制限設定を追加
         settings_to_add = [
@@ -436,7 +515,7 @@ def run_migration_004(db):
                 setting,
             )
 
-        print("Added admin session management settings")
+        logger.info("Added admin session management settings")
 
         # admin_session_events テーブル作成
         db.execute(
@@ -453,7 +532,7 @@ def run_migration_004(db):
             )
         """
         )
-        print("Created admin_session_events table")
+        logger.info("Created admin_session_events table")
 
         # インデックス作成
         session_event_indexes = [
@@ -464,13 +543,14 @@ def run_migration_004(db):
 
         for index_sql in session_event_indexes:
             db.execute(index_sql)
-        print("Created admin session event indexes")
+        logger.info("Created admin session event indexes")
 
         # マイグレーション実行記録
         db.execute(
             """
-            INSERT OR REPLACE INTO migrations (name, description)
+            INSERT INTO migrations (name, description)
             VALUES (?, ?)
+            ON CONFLICT(name) DO NOTHING
         """,
             (
                 "004_admin_role_session_management",
@@ -479,39 +559,68 @@ def run_migration_004(db):
         )
 
         # 既にコンテキストマネージャー内のため、COMMITは不要
-        print("Migration 004 completed successfully")
+        logger.info("Migration 004 completed successfully")
 
     except Exception as e:
-        print(f"Migration 004 failed: {str(e)}")
+        logger.error(f"Migration 004 failed: {str(e)}")
         raise
 
 
+@contextmanager
+def _migration_pragmas(db):
+    """
+    マイグレーション中だけ PRAGMA を調整し、終了後に元の値へ戻す
+    """
+    original_values = []
+    for name, value in _MIGRATION_PRAGMAS:
+        current = db.execute(f"PRAGMA {name}").fetchone()[0]
+        if current != value:
+            original_values.append((name, current))
+            db.execute(f"PRAGMA {name} = {value}")
+
+    try:
+        yield
+    finally:
+        for name, value in original_values:
+            db.execute(f"PRAGMA {name} = {value}")
+
+
+# 利用可能なマイグレーション（適用順）
+_AVAILABLE_MIGRATIONS = (
+    ("001_password_to_passphrase", run_migration_001),
+    ("002_security_event_logging", run_migration_002),
+    ("003_pdf_table_columns", run_migration_003),
+    ("004_admin_role_session_management", run_migration_004),
+)
+
+
 def run_all_migrations(db):
     """全てのマイグレーションを実行"""
     applied_migrations = get_applied_migrations(db)
-
-    # 利用可能なマイグレーション
-    available_migrations = [
-        ("001_password_to_passphrase", run_migration_001),
-        ("002_security_event_logging", run_migration_002),
-        ("003_pdf_table_columns", run_migration_003),
-        ("004_admin_role_session_management", run_migration_004),
+    pending_migrations = [
+        (migration_name, migration_func)
+        for migration_name, migration_func in _AVAILABLE_MIGRATIONS
+        if migration_name not in applied_migrations
     ]
 
-    for migration_name, migration_func in available_migrations:
-        if migration_name not in applied_migrations:
-            print(f"Applying migration: {migration_name}")
+    # 起動のたびに呼ばれるため、適用済みのみの場合は何もせずに戻る
+    if not pending_migrations:
+        return
+
+    with _migration_pragmas(db):
+        for migration_name, migration_func in pending_migrations:
+            logger.info(f"Applying migration: {migration_name}")
             migration_func(db)
-        else:
-            print(f"Migration already applied: {migration_name}")
 
-    print("All migrations completed")
+    logger.info("All migrations completed")
 
 
 if __name__ == "__main__":
     # テスト用
     import os
 
+    logging.basicConfig(level=logging.INFO)
+
     db_path = "/tmp/test_migration.db"
 
     # テストデータベース作成
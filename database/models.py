@@ -1,9 +1,114 @@
 """
 データベースモデル定義とテーブル作成
 """
+import json
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import database
 from config.timezone import get_app_now, get_app_datetime_string
 
+# ログのINSERT文（ステートメントキャッシュに載せるため共通化）
+_INSERT_ACCESS_LOG_SQL = """
+    INSERT INTO access_logs (session_id, email_hash, ip_address, user_agent, device_type, screen_resolution, endpoint, method, status_code, access_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_EVENT_LOG_SQL = """
+    INSERT INTO event_logs (session_id, email_hash, event_type, event_data, timestamp, ip_address, device_info, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_AUTH_FAILURE_SQL = """
+    INSERT INTO auth_failures (ip_address, failure_type, email_attempted, device_type, attempt_time)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_INSERT_SECURITY_EVENT_SQL = """
+    INSERT INTO security_events 
+    (user_email, event_type, event_details, risk_level, ip_address, user_agent, occurred_at, pdf_file_path, session_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# log_security_event で受け付けるリスクレベル・イベントタイプ
+_VALID_RISK_LEVELS = frozenset(("low", "medium", "high"))
+_VALID_SECURITY_EVENT_TYPES = frozenset(
+    (
+        "pdf_view",
+        "download_attempt",
+        "print_attempt",
+        "direct_access",
+        "devtools_open",
+        "unauthorized_action",
+        "page_leave",
+        "screenshot_attempt",
+        "copy_attempt",
+        "admin_operation",
+    )
+)
+
+# 設定の取得・更新SQL（sqlite3 のステートメントキャッシュに載せるため文字列を共通化）
+_SELECT_SETTING_SQL = "SELECT value, value_type FROM settings WHERE key = ?"
+_UPDATE_SETTING_SQL = """
+    UPDATE settings 
+    SET value = ?, updated_at = ?, updated_by = ?
+    WHERE key = ?
+"""
+_INSERT_SETTING_SQL = """
+    INSERT INTO settings (key, value, value_type, description, category, created_at, updated_at, updated_by)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_SETTING_HISTORY_SQL = """
+    INSERT INTO settings_history (setting_key, old_value, new_value, changed_by)
+    VALUES (?, ?, ?, ?)
+"""
+
+# value_type が boolean の設定値で真とみなす文字列
+_TRUE_STRINGS = frozenset(("true", "1", "yes"))
+
+# イベントログのJSONエンコーダ（区切りの空白と非ASCII文字のエスケープを省いて行サイズを抑える）
+_encode_log_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+# is_admin の否定結果キャッシュ（{(データベースパス, メールアドレス): 取得時刻}、取得時刻順）
+# 権限の無効化はワーカー間で即時反映させるため、管理者でないという結果のみ保持する。
+# 任意のメールアドレスで照会されても増え続けないよう件数に上限を設ける
+_ADMIN_CACHE_TTL = 30
+_ADMIN_CACHE_MAX_ENTRIES = 1024
+_admin_cache = OrderedDict()
+_admin_cache_lock = threading.Lock()
+
+# 一括投入時に削除し、create_indexes で再作成するログテーブルのインデックス
+_BACKFILL_DROP_INDEXES = (
+    "idx_access_logs_session_time",
+    "idx_access_logs_time_cover",
+    "idx_event_logs_session_time",
+    "idx_event_logs_type_time",
+    "idx_event_logs_created_at",
+)
+
+
+@contextmanager
+def _transaction(db):
+    """
+    スキーマ作成・初期データ投入を1トランザクションにまとめる
+
+    呼び出し元が既にトランザクション中の場合は何もしない（呼び出し元のコミットに任せる）
+
+    Args:
+        db: データベース接続
+    """
+    if db.in_transaction:
+        yield
+        return
+
+    db.execute("BEGIN")
+    try:
+        yield
+    except Exception:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
 
 def insert_with_app_timestamp(db, table, columns, values, timestamp_columns=None):
     """
@@ -82,12 +187,20 @@ def update_with_app_timestamp(
 
 def create_tables(db):
     """全てのテーブルを作成"""
+    # DDLは自動コミットされるため、明示的なトランザクションで fsync を1回にまとめる
+    with _transaction(db):
+        _create_tables(db)
+
+
+def _create_tables(db):
+    """全てのテーブルを作成（トランザクション管理は呼び出し元で行う）"""
 
     # アクセスログテーブル
+    # 書き込みの多いログテーブルは AUTOINCREMENT を付けず、INSERT毎の sqlite_sequence 更新を避ける
     db.execute(
         """
         CREATE TABLE IF NOT EXISTS access_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             session_id TEXT,
             email_hash TEXT,
             ip_address TEXT,
@@ -106,7 +219,7 @@ def create_tables(db):
     db.execute(
         """
         CREATE TABLE IF NOT EXISTS event_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             session_id TEXT,
             email_hash TEXT,
             event_type TEXT,
@@ -123,7 +236,7 @@ def create_tables(db):
     db.execute(
         """
         CREATE TABLE IF NOT EXISTS auth_failures (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             ip_address TEXT,
             attempt_time TEXT,
             failure_type TEXT,
@@ -179,6 +292,23 @@ def create_tables(db):
     """
     )
 
+    # 設定値の更新時に変更履歴を自動記録するトリガー
+    # （値が変わらない更新は記録しない。settings を UPDATE する処理は
+    # 変更者を履歴に残すため、必ず updated_by も同じ文で設定すること）
+    # 既存データベースの旧定義を置き換えるため、毎回作り直す
+    db.execute("DROP TRIGGER IF EXISTS trg_settings_history")
+    db.execute(
+        """
+        CREATE TRIGGER trg_settings_history
+        AFTER UPDATE OF value ON settings
+        WHEN OLD.value IS NOT NEW.value
+        BEGIN
+            INSERT INTO settings_history (setting_key, old_value, new_value, changed_by)
+            VALUES (NEW.key, OLD.value, NEW.value, COALESCE(NEW.updated_by, 'system'));
+        END
+    """
+    )
+
     # 管理者権限テーブル
     db.execute(
         """
@@ -214,32 +344,32 @@ def create_tables(db):
     """
     )
 
-    # 既存テーブルにmemoカラムを追加（マイグレーション）
-    try:
-        db.execute('ALTER TABLE session_stats ADD COLUMN memo TEXT DEFAULT ""')
-        print("session_stats テーブルに memo カラムを追加しました")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" not in str(e).lower():
-            print(f"memo カラム追加エラー: {e}")
-        # カラムが既に存在する場合は無視
-
-    # email_addressカラムを追加（メールアドレス表示問題解決）
-    try:
-        db.execute('ALTER TABLE session_stats ADD COLUMN email_address TEXT DEFAULT ""')
-        print("session_stats テーブルに email_address カラムを追加しました")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" not in str(e).lower():
-            print(f"email_address カラム追加エラー: {e}")
-        # カラムが既に存在する場合は無視
-
-    # admin_usersテーブルにupdated_atカラムを追加（管理者権限システム）
-    try:
-        db.execute("ALTER TABLE admin_users ADD COLUMN updated_at TEXT DEFAULT NULL")
-        print("admin_users テーブルに updated_at カラムを追加しました")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" not in str(e).lower():
-            print(f"updated_at カラム追加エラー: {e}")
-        # カラムが既に存在する場合は無視
+    # 既存テーブルへのカラム追加（マイグレーション）
+    # - session_stats.memo
+    # - session_stats.email_address（メールアドレス表示問題解決）
+    # - admin_users.updated_at（管理者権限システム）
+    # 毎回 ALTER を試して重複エラーを無視する代わりに、既存カラムを確認してから追加する
+    added_columns = (
+        ("session_stats", "memo", 'TEXT DEFAULT ""'),
+        ("session_stats", "email_address", 'TEXT DEFAULT ""'),
+        ("admin_users", "updated_at", "TEXT DEFAULT NULL"),
+    )
+    table_columns = {}
+    for table_name, column_name, column_def in added_columns:
+        if table_name not in table_columns:
+            table_columns[table_name] = {
+                row[1] for row in db.execute(f"PRAGMA table_info({table_name})")
+            }
+        if column_name in table_columns[table_name]:
+            continue
+
+        try:
+            db.execute(
+                f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_def}"
+            )
+            print(f"{table_name} テーブルに {column_name} カラムを追加しました")
+        except sqlite3.OperationalError as e:
+            print(f"{column_name} カラム追加エラー: {e}")
 
     # セキュリティイベントテーブル
     db.execute(
@@ -409,13 +539,26 @@ def create_indexes(db):
     """パフォーマンス向上のためのインデックス作成"""
 
     indexes = [
-        "CREATE INDEX IF NOT EXISTS idx_access_logs_session_id ON access_logs(session_id)",
-        "CREATE INDEX IF NOT EXISTS idx_access_logs_time ON access_logs(access_time)",
-        "CREATE INDEX IF NOT EXISTS idx_event_logs_session_id ON event_logs(session_id)",
-        "CREATE INDEX IF NOT EXISTS idx_event_logs_type ON event_logs(event_type)",
-        "CREATE INDEX IF NOT EXISTS idx_auth_failures_ip ON auth_failures(ip_address)",
+        # セッション・種別単位の絞り込みと時刻順の並べ替えを1つの複合インデックスで処理
+        "CREATE INDEX IF NOT EXISTS idx_access_logs_session_time ON access_logs(session_id, access_time)",
+        # 期間指定の集計（エンドポイント・ステータス・メソッド別）をインデックスのみで処理
+        "CREATE INDEX IF NOT EXISTS idx_access_logs_time_cover ON access_logs(access_time, endpoint, status_code, method)",
+        "CREATE INDEX IF NOT EXISTS idx_event_logs_session_time ON event_logs(session_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_event_logs_type_time ON event_logs(event_type, timestamp)",
+        # 保持期間を過ぎたイベントログの削除（created_at < ?）を範囲検索で行う
+        "CREATE INDEX IF NOT EXISTS idx_event_logs_created_at ON event_logs(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_auth_failures_ip_time ON auth_failures(ip_address, attempt_time)",
         "CREATE INDEX IF NOT EXISTS idx_auth_failures_time ON auth_failures(attempt_time)",
-        "CREATE INDEX IF NOT EXISTS idx_settings_key ON settings(key)",
+        # 有効なブロック数の集計・期限切れブロックの削除を範囲検索で行う
+        "CREATE INDEX IF NOT EXISTS idx_ip_blocks_blocked_until ON ip_blocks(blocked_until)",
+        # 複合インデックスの先頭カラムと重複する旧インデックスを削除
+        "DROP INDEX IF EXISTS idx_access_logs_session_id",
+        "DROP INDEX IF EXISTS idx_event_logs_session_id",
+        "DROP INDEX IF EXISTS idx_event_logs_type",
+        "DROP INDEX IF EXISTS idx_auth_failures_ip",
+        "DROP INDEX IF EXISTS idx_access_logs_time",
+        # settings.key は UNIQUE 制約の自動インデックスで検索されるため重複分を削除
+        "DROP INDEX IF EXISTS idx_settings_key",
         "CREATE INDEX IF NOT EXISTS idx_settings_category ON settings(category)",
         "CREATE INDEX IF NOT EXISTS idx_settings_history_key ON settings_history(setting_key)",
         "CREATE INDEX IF NOT EXISTS idx_settings_history_changed_at ON settings_history(changed_at)",
@@ -423,7 +566,9 @@ def create_indexes(db):
         "CREATE INDEX IF NOT EXISTS idx_session_stats_start_time ON session_stats(start_time)",
         "CREATE INDEX IF NOT EXISTS idx_security_events_user_email ON security_events(user_email)",
         "CREATE INDEX IF NOT EXISTS idx_security_events_event_type ON security_events(event_type)",
-        "CREATE INDEX IF NOT EXISTS idx_security_events_occurred_at ON security_events(occurred_at)",
+        # 期間指定の集計（リスクレベル・イベントタイプ別）をインデックスのみで処理
+        "CREATE INDEX IF NOT EXISTS idx_security_events_time_cover ON security_events(occurred_at, risk_level, event_type)",
+        "DROP INDEX IF EXISTS idx_security_events_occurred_at",
         "CREATE INDEX IF NOT EXISTS idx_otp_tokens_email ON otp_tokens(email)",
         "CREATE INDEX IF NOT EXISTS idx_otp_tokens_expires_at ON otp_tokens(expires_at)",
         "CREATE INDEX IF NOT EXISTS idx_otp_tokens_used ON otp_tokens(used)",
@@ -449,8 +594,9 @@ def create_indexes(db):
         "CREATE INDEX IF NOT EXISTS idx_pdf_files_published_date ON pdf_files(published_date)",
     ]
 
-    for index_sql in indexes:
-        db.execute(index_sql)
+    with _transaction(db):
+        for index_sql in indexes:
+            db.execute(index_sql)
 
 
 def generate_initial_passphrase():
@@ -465,11 +611,17 @@ def generate_initial_passphrase():
 
 def insert_initial_data(db):
     """初期データの挿入"""
+    with _transaction(db):
+        _insert_initial_data(db)
+
 
-    # 既存の設定をチェック
-    existing_settings = db.execute("SELECT COUNT(*) as count FROM settings").fetchone()
+def _insert_initial_data(db):
+    """初期データの挿入（トランザクション管理は呼び出し元で行う）"""
 
-    if existing_settings["count"] == 0:
+    # 既存の設定をチェック（件数は不要なため1行の有無のみ確認）
+    existing_settings = db.execute("SELECT 1 FROM settings LIMIT 1").fetchone()
+
+    if existing_settings is None:
         # 初期パスフレーズを生成
         initial_passphrase = generate_initial_passphrase()
         print(f"初期パスフレーズが生成されました: {initial_passphrase}")
@@ -576,21 +728,20 @@ def insert_initial_data(db):
             ),
         ]
 
-        for setting in initial_settings:
-            db.execute(
-                """
-                INSERT INTO settings (key, value, value_type, description, category, is_sensitive)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                setting,
-            )
+        db.executemany(
+            """
+            INSERT INTO settings (key, value, value_type, description, category, is_sensitive)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            initial_settings,
+        )
 
         print("Initial settings data inserted.")
 
     # 既存の管理者をチェック
-    existing_admins = db.execute("SELECT COUNT(*) as count FROM admin_users").fetchone()
+    existing_admins = db.execute("SELECT 1 FROM admin_users LIMIT 1").fetchone()
 
-    if existing_admins["count"] == 0:
+    if existing_admins is None:
         # .envからADMIN_EMAILを取得して初期管理者を追加
         import os
 
@@ -608,81 +759,91 @@ def insert_initial_data(db):
             print("Warning: ADMIN_EMAIL not found in environment variables")
 
 
-def get_setting(db, key, default=None):
-    """設定値を取得"""
-    db.row_factory = sqlite3.Row
-    row = db.execute(
-        "SELECT value, value_type FROM settings WHERE key = ?", (key,)
-    ).fetchone()
-    if not row:
-        return default
-
-    value = row["value"]
-    value_type = row["value_type"]
-
-    # 型変換
+def _convert_setting_value(value, value_type, default):
+    """value_type に応じて設定値を型変換"""
     if value is None:
         return default
     elif value_type == "integer":
         return int(value)
     elif value_type == "boolean":
-        return value.lower() in ("true", "1", "yes")
+        return value.lower() in _TRUE_STRINGS
     elif value_type == "json":
-        import json
-
         return json.loads(value)
     else:
         return value
 
 
+def get_setting(db, key, default=None):
+    """
+    設定値を取得
+
+    共有接続の row_factory は変更せず、位置で値を取り出す
+    """
+    row = db.execute(_SELECT_SETTING_SQL, (key,)).fetchone()
+    if not row:
+        return default
+
+    # 型変換
+    value, value_type = row
+    return _convert_setting_value(value, value_type, default)
+
+
+def get_settings(db, defaults):
+    """
+    複数の設定値を1回のクエリで取得
+
+    Args:
+        db: データベース接続
+        defaults: {設定キー: デフォルト値} の辞書
+
+    Returns:
+        dict: {設定キー: 型変換済みの値}（未設定のキーはデフォルト値）
+    """
+    keys = list(defaults)
+    placeholders = ", ".join(["?"] * len(keys))
+    rows = db.execute(
+        f"SELECT key, value, value_type FROM settings WHERE key IN ({placeholders})",
+        keys,
+    ).fetchall()
+
+    settings = dict(defaults)
+    for key, value, value_type in rows:
+        settings[key] = _convert_setting_value(value, value_type, defaults[key])
+    return settings
+
+
 def set_setting(db, key, value, updated_by="system"):
-    """設定値を更新または作成"""
-    # 現在の値を取得（履歴用）
-    db.row_factory = sqlite3.Row
-    current_row = db.execute(
-        "SELECT value FROM settings WHERE key = ?", (key,)
-    ).fetchone()
-    old_value = current_row["value"] if current_row else None
-
-    if current_row:
-        # 既存設定の更新
-        db.execute(
-            """
-            UPDATE settings 
-            SET value = ?, updated_at = ?, updated_by = ?
-            WHERE key = ?
-        """,
-            (str(value), get_app_datetime_string(), updated_by, key),
-        )
-    else:
-        # 新規設定の追加
-        now_str = get_app_datetime_string()
-        db.execute(
-            """
-            INSERT INTO settings (key, value, value_type, description, category, created_at, updated_at, updated_by)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                key,
-                str(value),
-                "string",
-                f"動的設定: {key}",
-                "session",
-                now_str,
-                now_str,
-                updated_by,
-            ),
-        )
+    """
+    設定値を更新または作成
+
+    既存設定の変更履歴は trg_settings_history トリガーが updated_by を変更者として記録する。
+    """
+    new_value = str(value)
+    now_str = get_app_datetime_string()
+
+    # 既存設定の更新
+    cursor = db.execute(_UPDATE_SETTING_SQL, (new_value, now_str, updated_by, key))
+    if cursor.rowcount:
+        return
 
-    # 履歴に記録
+    # 新規設定の追加
     db.execute(
-        """
-        INSERT INTO settings_history (setting_key, old_value, new_value, changed_by)
-        VALUES (?, ?, ?, ?)
-    """,
-        (key, old_value, str(value), updated_by),
+        _INSERT_SETTING_SQL,
+        (
+            key,
+            new_value,
+            "string",
+            f"動的設定: {key}",
+            "session",
+            now_str,
+            now_str,
+            updated_by,
+        ),
     )
 
+    # 履歴に記録（新規追加はトリガーの対象外）
+    db.execute(_INSERT_SETTING_HISTORY_SQL, (key, None, new_value, updated_by))
+
 
 def log_access(
     db,
@@ -697,48 +858,72 @@ def log_access(
     screen_resolution=None,
 ):
     """アクセスログを記録"""
-    db.execute(
-        """
-        INSERT INTO access_logs (session_id, email_hash, ip_address, user_agent, device_type, screen_resolution, endpoint, method, status_code, access_time)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        (
-            session_id,
-            email_hash,
-            ip_address,
-            user_agent,
-            device_type,
-            screen_resolution,
-            endpoint,
-            method,
-            status_code,
-            get_app_datetime_string(),
-        ),
+    params = (
+        session_id,
+        email_hash,
+        ip_address,
+        user_agent,
+        device_type,
+        screen_resolution,
+        endpoint,
+        method,
+        status_code,
+        get_app_datetime_string(),
     )
+    db.execute(_INSERT_ACCESS_LOG_SQL, params)
 
 
 def log_event(
-    db, session_id, email_hash, event_type, event_data, ip_address, device_info=None
+    db,
+    session_id,
+    email_hash,
+    event_type,
+    event_data,
+    ip_address,
+    device_info=None,
 ):
     """イベントログを記録"""
-    import json
-
-    db.execute(
-        """
-        INSERT INTO event_logs (session_id, email_hash, event_type, event_data, timestamp, ip_address, device_info, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        (
-            session_id,
-            email_hash,
-            event_type,
-            json.dumps(event_data),
-            int(get_app_now().timestamp()),
-            ip_address,
-            json.dumps(device_info) if device_info else None,
-            get_app_datetime_string(),
-        ),
+    params = (
+        session_id,
+        email_hash,
+        event_type,
+        _encode_log_json(event_data),
+        int(get_app_now().timestamp()),
+        ip_address,
+        _encode_log_json(device_info) if device_info else None,
+        get_app_datetime_string(),
     )
+    db.execute(_INSERT_EVENT_LOG_SQL, params)
+
+
+def bulk_backfill_logs(db, access_rows=(), event_rows=()):
+    """
+    過去ログを一括投入する（オフライン専用）
+
+    投入中のインデックス更新を避けるため、ログテーブルのインデックスを削除してから
+    executemany で書き込み、最後に create_indexes で再作成する。
+    インデックスが存在しない間は他の処理のクエリが全件走査になり、書き込みロックも
+    保持し続けるため、アプリケーション稼働中には実行しないこと。
+
+    Args:
+        db: データベース接続
+        access_rows: access_logs の行（_INSERT_ACCESS_LOG_SQL のカラム順のタプル）
+        event_rows: event_logs の行（_INSERT_EVENT_LOG_SQL のカラム順のタプル）
+
+    Returns:
+        int: 投入した件数
+    """
+    access_rows = list(access_rows)
+    event_rows = list(event_rows)
+
+    with _transaction(db):
+        for index_name in _BACKFILL_DROP_INDEXES:
+            db.execute(f"DROP INDEX IF EXISTS {index_name}")
+        db.executemany(_INSERT_ACCESS_LOG_SQL, access_rows)
+        db.executemany(_INSERT_EVENT_LOG_SQL, event_rows)
+        create_indexes(db)
+
+    return len(access_rows) + len(event_rows)
 
 
 def log_auth_failure(
@@ -746,10 +931,7 @@ def log_auth_failure(
 ):
     """認証失敗ログを記録"""
     db.execute(
-        """
-        INSERT INTO auth_failures (ip_address, failure_type, email_attempted, device_type, attempt_time)
-        VALUES (?, ?, ?, ?, ?)
-    """,
+        _INSERT_AUTH_FAILURE_SQL,
         (
             ip_address,
             failure_type,
@@ -772,36 +954,17 @@ def log_security_event(
     session_id=None,
 ):
     """セキュリティイベントログを記録"""
-    import json
-
     # リスクレベルの検証
-    valid_risk_levels = ["low", "medium", "high"]
-    if risk_level not in valid_risk_levels:
+    if risk_level not in _VALID_RISK_LEVELS:
         risk_level = "low"
 
     # イベントタイプの検証
-    valid_event_types = [
-        "pdf_view",
-        "download_attempt",
-        "print_attempt",
-        "direct_access",
-        "devtools_open",
-        "unauthorized_action",
-        "page_leave",
-        "screenshot_attempt",
-        "copy_attempt",
-        "admin_operation",
-    ]
-    if event_type not in valid_event_types:
+    if event_type not in _VALID_SECURITY_EVENT_TYPES:
         event_type = "unauthorized_action"
         risk_level = "high"
 
     db.execute(
-        """
-        INSERT INTO security_events 
-        (user_email, event_type, event_details, risk_level, ip_address, user_agent, occurred_at, pdf_file_path, session_id)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
+        _INSERT_SECURITY_EVENT_SQL,
         (
             user_email,
             event_type,
@@ -1090,6 +1253,9 @@ def is_admin(email):
     """
     メールアドレスが有効な管理者かチェック
 
+    管理者でないという判定結果のみデータベースごとに _ADMIN_CACHE_TTL 秒キャッシュする。
+    admin_users を変更した場合は invalidate_admin_cache を呼び出すこと。
+
     Args:
         email: チェック対象のメールアドレス
 
@@ -1101,8 +1267,15 @@ def is_admin(email):
 
     from database import get_db
 
+    cache_key = (database.DATABASE_PATH, email)
+    with _admin_cache_lock:
+        cached_at = _admin_cache.get(cache_key)
+        if cached_at is not None:
+            if time.monotonic() - cached_at < _ADMIN_CACHE_TTL:
+                return False
+            del _admin_cache[cache_key]
+
     with get_db() as db:
-        db.row_factory = sqlite3.Row
         result = db.execute(
             """
             SELECT id FROM admin_users 
@@ -1111,7 +1284,37 @@ def is_admin(email):
             (email,),
         ).fetchone()
 
-        return result is not None
+    with _admin_cache_lock:
+        if result is not None:
+            _admin_cache.pop(cache_key, None)
+            return True
+
+        now = time.monotonic()
+        _admin_cache[cache_key] = now
+        _admin_cache.move_to_end(cache_key)
+        # 取得時刻順に並ぶため、先頭から期限切れと上限超過分を破棄する
+        while _admin_cache and (
+            len(_admin_cache) > _ADMIN_CACHE_MAX_ENTRIES
+            or now - next(iter(_admin_cache.values())) >= _ADMIN_CACHE_TTL
+        ):
+            _admin_cache.popitem(last=False)
+        return False
+
+
+def invalidate_admin_cache(email=None):
+    """
+    is_admin の判定キャッシュを破棄
+
+    Args:
+        email: 破棄する管理者のメールアドレス（None の場合は全件破棄）
+    """
+    with _admin_cache_lock:
+        if email is None:
+            _admin_cache.clear()
+            return
+
+        for cache_key in [key for key in _admin_cache if key[1] == email]:
+            del _admin_cache[cache_key]
 
 
 def add_admin_user(email, added_by):
@@ -1175,6 +1378,8 @@ def add_admin_user(email, added_by):
                 "add_admin", email, added_by, {"new_admin_email": email}
             )
 
+            db.commit()
+            invalidate_admin_cache(email)
             print(f"add_admin_user: Successfully added {email}")
             return True
 
@@ -1268,6 +1473,7 @@ def update_admin_status(admin_id, is_active):
             )
 
             db.commit()
+            invalidate_admin_cache(admin["email"])
             return True
 
         except sqlite3.Error:
@@ -1338,6 +1544,7 @@ def delete_admin_user(admin_id, permanent=False):
             )
 
             db.commit()
+            invalidate_admin_cache(admin["email"])
             return True
 
         except sqlite3.Error:
@@ -1402,7 +1609,6 @@ def create_admin_session(
     Returns:
         bool: 作成に成功した場合True
     """
-    import json
     import secrets
 
     if not admin_email or not session_id:
@@ -1483,8 +1689,6 @@ def verify_admin_session(session_id, current_ip=None, current_ua=None):
     Returns:
         dict: セッションデータ（検証失敗時はNone）
     """
-    import json
-
     if not session_id:
         return None
 
@@ -1952,7 +2156,6 @@ def log_session_event(
         event_type: イベントタイプ ('created', 'rotated', 'expired', 'limit_exceeded')
         details: 詳細情報（dict）
     """
-    import json
     from database import get_db
 
     try:
@@ -2417,7 +2620,6 @@ def regenerate_admin_session_id(old_session_id, new_session_id):
         return False
 
     from database import get_db
-    import json
     from config.timezone import get_app_datetime_string, get_app_now
 
     try:
@@ -2503,7 +2705,6 @@ def verify_session_environment(session_id, current_ip, current_ua):
         }
 
     from database import get_db
-    import json
     from config.timezone import get_app_now, to_app_timezone
     from datetime import timedelta
 
@@ -2651,7 +2852,6 @@ def detect_session_anomalies(admin_email, session_id, current_ip, current_ua):
         }
 
     from database import get_db
-    import json
     from config.timezone import get_app_now, to_app_timezone
     from datetime import timedelta, datetime as dt
 
@@ -3038,7 +3238,6 @@ def log_admin_action(
 
     try:
         from database import get_db
-        import json
         from config.timezone import get_app_datetime_string
         import secrets
 
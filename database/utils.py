@@ -5,12 +5,31 @@
 import hashlib
 import time
 from datetime import datetime, timedelta
-from .models import get_setting, set_setting, log_access, log_event, log_auth_failure
+from .models import (
+    get_setting, set_setting, log_access, log_event, log_auth_failure,
+    invalidate_admin_cache
+)
 from config.timezone import (
     get_app_now, get_app_datetime_string, localize_datetime,
     to_app_timezone, add_app_timedelta, compare_app_datetimes
 )
 
+def _get_today_range():
+    """
+    今日の日付範囲を取得
+
+    DATE(カラム) = ? は時刻カラムのインデックスを使えないため、
+    カラム >= 今日 AND カラム < 明日 の範囲条件で絞り込む際に使用する
+
+    Returns:
+        tuple: (今日, 明日) の YYYY-MM-DD 形式の文字列
+    """
+    now = get_app_now()
+    return (
+        now.strftime('%Y-%m-%d'),
+        (now + timedelta(days=1)).strftime('%Y-%m-%d'),
+    )
+
 def hash_email(email):
     """メールアドレスをハッシュ化（プライバシー保護）"""
     return hashlib.sha256(email.encode()).hexdigest()[:16]
@@ -106,11 +125,11 @@ def get_recent_access_logs(db, limit=50):
 def get_system_stats(db):
     """システム統計情報を取得"""
     # 今日のアクセス数
-    today = get_app_now().strftime('%Y-%m-%d')
+    today, tomorrow = _get_today_range()
     today_access = db.execute('''
         SELECT COUNT(*) as count FROM access_logs 
-        WHERE DATE(access_time) = ?
-    ''', (today,)).fetchone()
+        WHERE access_time >= ? AND access_time < ?
+    ''', (today, tomorrow)).fetchone()
     
     # 総ユーザー数（ユニークなemail_hash）
     total_users = db.execute('''
@@ -149,6 +168,7 @@ def add_admin_user(db, email, added_by='system'):
             INSERT INTO admin_users (email, added_by)
             VALUES (?, ?)
         ''', (email, added_by))
+        invalidate_admin_cache(email)
         return True
     except Exception:
         return False
@@ -159,6 +179,7 @@ def remove_admin_user(db, email):
         UPDATE admin_users SET is_active = FALSE 
         WHERE email = ?
     ''', (email,))
+    invalidate_admin_cache(email)
 
 def validate_session_timeout():
     """セッションタイムアウトの妥当性チェック"""
@@ -363,11 +384,11 @@ class RateLimitManager:
         ''', (get_app_datetime_string(),)).fetchone()
         
         # 今日の認証失敗数
-        today = get_app_now().strftime('%Y-%m-%d')
+        today, tomorrow = _get_today_range()
         today_failures = self.db.execute('''
             SELECT COUNT(*) as count FROM auth_failures 
-            WHERE DATE(attempt_time) = ?
-        ''', (today,)).fetchone()
+            WHERE attempt_time >= ? AND attempt_time < ?
+        ''', (today, tomorrow)).fetchone()
         
         # 今日のIP制限数（UTC基準）
         today_blocks = self.db.execute('''
@@ -2,6 +2,7 @@
 """
 BackupManagerクラスの単体テスト
 """
+import errno
 import unittest
 import tempfile
 import os
@@ -9,12 +10,17 @@ import sqlite3
 import tarfile
 import json
 import shutil
+import hashlib
+import threading
 from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
 import sys
 
 # プロジェクトルートをパスに追加
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from database import backup as backup_module  # noqa: E402
 from database.backup import BackupManager  # noqa: E402
 
 
@@ -148,6 +154,16 @@ PASSWORD=sensitive_password_789
         self.assertIn("files_count", metadata)
         self.assertIn("checksum", metadata)
 
+        # ファイル一覧はメタデータではなくアーカイブ内の files.txt に記録
+        self.assertNotIn("files", metadata)
+        self.assertEqual(metadata["files_counts"]["pdfs"], 3)
+        self.assertEqual(
+            metadata["files_count"], sum(metadata["files_counts"].values())
+        )
+        with tarfile.open(backup_file, "r:gz") as tar:
+            listing = tar.extractfile(f"{backup_name}/files.txt").read().decode()
+        self.assertIn(os.path.join("files", "pdfs", "test1.pdf"), listing.splitlines())
+
     def test_backup_database_safe(self):
         """SQLite安全バックアップのテスト"""
         temp_backup_dir = tempfile.mkdtemp()
@@ -176,6 +192,15 @@ PASSWORD=sensitive_password_789
             self.assertEqual(rows[0][1], "test_user")
             conn.close()
 
+            # スキーマファイルにはDDLのみが含まれることを確認
+            schema_path = os.path.join(
+                temp_backup_dir, "database", "database_schema.sql"
+            )
+            with open(schema_path, "r") as f:
+                schema = f.read()
+            self.assertIn("CREATE TABLE users", schema)
+            self.assertNotIn("INSERT", schema)
+
         finally:
             shutil.rmtree(temp_backup_dir, ignore_errors=True)
 
@@ -206,46 +231,92 @@ PASSWORD=sensitive_password_789
         finally:
             shutil.rmtree(temp_backup_dir, ignore_errors=True)
 
-    def test_backup_pdf_files(self):
-        """PDFファイルバックアップのテスト"""
-        temp_backup_dir = tempfile.mkdtemp()
+    def test_mask_env_text_matches_line_masking(self):
+        """一括置換によるマスク結果が行単位のマスク結果と一致することを確認"""
+        from database.backup import ENV_ASSIGNMENT_RE
+
+        text = (
+            "# SECRET_KEY=commented\n"
+            "  # PASSWORD=indented comment\n"
+            "export AUTH_TOKEN=abc\n"
+            "NORMAL=value=with=equals\n"
+            "no_assignment_line\n"
+            "\n"
+            " db_password = spaced \n"
+            "PUBLIC_URL=https://example.com\n"
+        )
+        expected = "".join(
+            self.backup_manager._mask_sensitive_info(line)
+            for line in text.splitlines(keepends=True)
+        )
+        masked = ENV_ASSIGNMENT_RE.sub(self.backup_manager._mask_env_match, text)
+
+        self.assertEqual(masked, expected)
+        self.assertIn("export AUTH_TOKEN=***MASKED***", masked)
+        self.assertIn("# SECRET_KEY=commented", masked)
+
+    def test_configure_source_conn(self):
+        """バックアップ元DB接続が読み取り専用に設定されることを確認"""
+        conn = sqlite3.connect(self.db_path)
         try:
-            pdf_files = self.backup_manager._backup_pdf_files(temp_backup_dir)
-
-            # PDFファイルがバックアップされていることを確認
-            self.assertTrue(
-                len(pdf_files) >= 3
-            )  # test1.pdf, test2.pdf, subfolder/test3.pdf
-
-            # バックアップされたファイルが存在することを確認
-            backup_pdf_dir = os.path.join(temp_backup_dir, "files", "pdfs")
-            self.assertTrue(os.path.exists(os.path.join(backup_pdf_dir, "test1.pdf")))
-            self.assertTrue(os.path.exists(os.path.join(backup_pdf_dir, "test2.pdf")))
-            self.assertTrue(
-                os.path.exists(os.path.join(backup_pdf_dir, "subfolder", "test3.pdf"))
+            self.backup_manager._configure_source_conn(conn)
+            self.assertEqual(conn.execute("PRAGMA query_only").fetchone()[0], 1)
+            self.assertEqual(
+                conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0], 0
             )
-
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("CREATE TABLE should_fail (id INTEGER)")
         finally:
-            shutil.rmtree(temp_backup_dir, ignore_errors=True)
+            conn.close()
+
+    def test_backup_pdf_files(self):
+        """PDFファイルバックアップのテスト"""
+        entries, pdf_files = self.backup_manager._backup_pdf_files()
+
+        # PDFファイルがバックアップ対象になっていることを確認
+        self.assertTrue(
+            len(pdf_files) >= 3
+        )  # test1.pdf, test2.pdf, subfolder/test3.pdf
+        self.assertIn("files/pdfs/test1.pdf", pdf_files)
+        self.assertIn("files/pdfs/test2.pdf", pdf_files)
+        self.assertIn("files/pdfs/subfolder/test3.pdf", pdf_files)
+
+        # 元ファイルから直接アーカイブへ追加されること（コピーしない）
+        arcnames = {arcname: source for source, arcname in entries}
+        self.assertEqual(
+            arcnames["files/pdfs/test1.pdf"],
+            os.path.join(self.pdf_dir, "test1.pdf"),
+        )
+        self.assertEqual(arcnames["files/pdfs"], self.pdf_dir)
+        self.assertIn("files/pdfs/subfolder", arcnames)
 
     def test_backup_log_files(self):
         """ログファイルバックアップのテスト"""
-        temp_backup_dir = tempfile.mkdtemp()
-        try:
-            log_files = self.backup_manager._backup_log_files(temp_backup_dir)
-
-            # ログファイルがバックアップされていることを確認
-            self.assertTrue(len(log_files) >= 2)  # app.log, emergency_log.txt
+        entries, log_files = self.backup_manager._backup_log_files()
+
+        # ログファイルがバックアップ対象になっていることを確認
+        self.assertTrue(len(log_files) >= 2)  # app.log, emergency_log.txt
+        self.assertEqual(
+            dict(entries),
+            {
+                os.path.join(self.logs_dir, "app.log"): "logs/app.log",
+                os.path.join(self.instance_dir, "emergency_log.txt"):
+                    "logs/emergency_log.txt",
+            },
+        )
 
-            # バックアップされたファイルが存在することを確認
-            backup_logs_dir = os.path.join(temp_backup_dir, "logs")
-            self.assertTrue(os.path.exists(os.path.join(backup_logs_dir, "app.log")))
-            self.assertTrue(
-                os.path.exists(os.path.join(backup_logs_dir, "emergency_log.txt"))
-            )
+    def test_create_backup_streams_logs(self):
+        """ログが元ファイルから直接アーカイブに格納されることを確認"""
+        backup_name = self.backup_manager.create_backup()
+        backup_file = os.path.join(self.backup_dir, "manual", f"{backup_name}.tar.gz")
 
-        finally:
-            shutil.rmtree(temp_backup_dir, ignore_errors=True)
+        source_log = os.path.join(self.logs_dir, "app.log")
+        with tarfile.open(backup_file, "r:gz") as tar:
+            member = tar.getmember(f"{backup_name}/logs/app.log")
+            archived = tar.extractfile(member).read()
+        with open(source_log, "rb") as f:
+            self.assertEqual(archived, f.read())
+        self.assertEqual(int(member.mtime), int(os.stat(source_log).st_mtime))
 
     def test_create_archive(self):
         """アーカイブ作成のテスト"""
@@ -256,7 +327,7 @@ PASSWORD=sensitive_password_789
             f.write("test content")
 
         try:
-            archive_path = self.backup_manager._create_archive(
+            archive_path, checksum = self.backup_manager._create_archive(
                 temp_data_dir, "test_backup"
             )
 
@@ -264,6 +335,14 @@ PASSWORD=sensitive_password_789
             self.assertTrue(os.path.exists(archive_path))
             self.assertTrue(archive_path.endswith(".tar.gz"))
 
+            # 所有者のみ読み書き可能な権限で作成されていることを確認
+            self.assertEqual(os.stat(archive_path).st_mode & 0o777, 0o600)
+
+            # 書き込み時に計算したチェックサムが再計算結果と一致することを確認
+            self.assertEqual(
+                checksum, self.backup_manager._calculate_checksum(archive_path)
+            )
+
             # アーカイブの中身確認
             with tarfile.open(archive_path, "r:gz") as tar:
                 members = tar.getnames()
@@ -274,6 +353,160 @@ PASSWORD=sensitive_password_789
             if os.path.exists(archive_path):
                 os.remove(archive_path)
 
+    def test_create_archive_stores_pdfs_uncompressed(self):
+        """PDFは無圧縮、その他は圧縮して単一の tar.gz に格納されることを確認"""
+        source_dir = os.path.join(self.test_dir, "work", "stored_backup")
+        pdf_dir = os.path.join(self.test_dir, "work", "pdfs")
+        os.makedirs(pdf_dir)
+        os.makedirs(os.path.join(source_dir, "logs"))
+        pdf_content = b"%PDF-1.4\n" + b"A" * 200000
+        log_content = "log line\n" * 20000
+        with open(os.path.join(pdf_dir, "doc.pdf"), "wb") as f:
+            f.write(pdf_content)
+        with open(os.path.join(source_dir, "logs", "app.log"), "w") as f:
+            f.write(log_content)
+
+        archive_path, checksum = self.backup_manager._create_archive(
+            source_dir,
+            "stored_backup",
+            stored_entries=[
+                (pdf_dir, "files/pdfs"),
+                (os.path.join(pdf_dir, "doc.pdf"), "files/pdfs/doc.pdf"),
+            ],
+        )
+
+        # PDFは圧縮されないため、アーカイブはPDFより大きくログ全体よりは小さい
+        archive_size = os.path.getsize(archive_path)
+        self.assertGreater(archive_size, len(pdf_content))
+        self.assertLess(archive_size, len(pdf_content) + len(log_content))
+
+        with tarfile.open(archive_path, "r:gz") as tar:
+            names = tar.getnames()
+            self.assertIn("stored_backup/logs/app.log", names)
+            self.assertEqual(
+                tar.extractfile("stored_backup/files/pdfs/doc.pdf").read(),
+                pdf_content,
+            )
+        self.assertEqual(
+            checksum, self.backup_manager._calculate_checksum(archive_path)
+        )
+
+    def test_create_archive_external_compressor(self):
+        """pigz（外部圧縮コマンド）経由でのアーカイブ作成テスト"""
+        if shutil.which("gzip") is None:
+            self.skipTest("gzip コマンドが利用できません")
+
+        # pigz の代わりに gzip を呼び出し、呼び出し記録を残すスクリプトを用意
+        fake_bin_dir = os.path.join(self.test_dir, "bin")
+        os.makedirs(fake_bin_dir)
+        fake_pigz = os.path.join(fake_bin_dir, "pigz")
+        called_marker = os.path.join(self.test_dir, "pigz_called")
+        with open(fake_pigz, "w") as f:
+            f.write(f"#!/bin/sh\ntouch {called_marker}\nexec gzip -c\n")
+        os.chmod(fake_pigz, 0o755)
+
+        source_dir = os.path.join(self.test_dir, "work", "external_backup")
+        os.makedirs(source_dir)
+        with open(os.path.join(source_dir, "test.txt"), "w") as f:
+            f.write("test content\n" * 1000)
+        pdf_path = os.path.join(self.test_dir, "work", "doc.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(b"%PDF-1.4\n" + os.urandom(4096))
+
+        real_which = shutil.which
+        with patch(
+            "database.backup.shutil.which",
+            side_effect=lambda cmd: fake_pigz if cmd == "pigz" else real_which(cmd),
+        ):
+            archive_path, checksum = self.backup_manager._create_archive(
+                source_dir,
+                "external_backup",
+                stored_entries=[(pdf_path, "files/pdfs/doc.pdf")],
+            )
+
+        self.assertTrue(os.path.exists(called_marker))
+        with tarfile.open(archive_path, "r:gz") as tar:
+            names = tar.getnames()
+            self.assertIn("external_backup/test.txt", names)
+            self.assertIn("external_backup/files/pdfs/doc.pdf", names)
+        self.assertEqual(
+            checksum, self.backup_manager._calculate_checksum(archive_path)
+        )
+
+    def test_create_archive_external_compressor_failure(self):
+        """外部圧縮コマンド失敗時に gzip モジュールで再作成されることを確認"""
+        if shutil.which("false") is None:
+            self.skipTest("false コマンドが利用できません")
+
+        source_dir = os.path.join(self.test_dir, "work", "fallback_backup")
+        os.makedirs(source_dir)
+        with open(os.path.join(source_dir, "test.txt"), "w") as f:
+            f.write("test content")
+
+        with patch.object(
+            self.backup_manager,
+            "_find_compress_command",
+            return_value=[shutil.which("false")],
+        ):
+            archive_path, checksum = self.backup_manager._create_archive(
+                source_dir, "fallback_backup"
+            )
+
+        with tarfile.open(archive_path, "r:gz") as tar:
+            self.assertIn("fallback_backup/test.txt", tar.getnames())
+        self.assertEqual(
+            checksum, self.backup_manager._calculate_checksum(archive_path)
+        )
+
+    def test_create_archive_external_compressor_output_error(self):
+        """外部圧縮コマンドの出力書き込み失敗時に停止せずエラーになることを確認"""
+        if shutil.which("gzip") is None:
+            self.skipTest("gzip コマンドが利用できません")
+
+        source_dir = os.path.join(self.test_dir, "work", "enospc_backup")
+        os.makedirs(source_dir)
+        with open(os.path.join(source_dir, "random.bin"), "wb") as f:
+            f.write(os.urandom(16 * 1024 * 1024))
+
+        class FailingFile:
+            """数回の書き込み後に ENOSPC を送出する出力ファイル"""
+
+            def __init__(self, path):
+                self._file = open(path, "wb")
+                self._writes = 0
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                self._file.close()
+
+            def write(self, data):
+                self._writes += 1
+                if self._writes > 2:
+                    raise OSError(errno.ENOSPC, "No space left on device")
+                return self._file.write(data)
+
+            def flush(self):
+                self._file.flush()
+
+        result = {}
+
+        def run():
+            try:
+                self.backup_manager._create_archive(source_dir, "enospc_backup")
+            except Exception as e:
+                result["error"] = e
+
+        with patch("database.backup._open_archive_file", FailingFile):
+            worker = threading.Thread(target=run, daemon=True)
+            worker.start()
+            worker.join(timeout=60)
+
+        self.assertFalse(worker.is_alive(), "アーカイブ作成が停止しました")
+        self.assertIsInstance(result.get("error"), OSError)
+        self.assertEqual(result["error"].errno, errno.ENOSPC)
+
     def test_list_backups(self):
         """バックアップ一覧取得のテスト"""
         # テスト用バックアップファイルとメタデータ作成
@@ -319,6 +552,110 @@ PASSWORD=sensitive_password_789
 
         self.assertTrue(backup_found, f"作成したバックアップ {backup_name} が一覧に見つかりません")
 
+    def test_list_backups_metadata_cache(self):
+        """メタデータ解析結果のキャッシュと更新検知のテスト"""
+        backup_name = self.backup_manager.create_backup()
+        metadata_file = os.path.abspath(
+            os.path.join(self.backup_dir, "metadata", f"{backup_name}.json")
+        )
+
+        first = self.backup_manager.list_backups()
+        self.assertEqual(len(first), 1)
+        self.assertIn(metadata_file, backup_module._metadata_cache)
+
+        # 返却値を変更してもキャッシュに影響しないことを確認
+        first[0]["type"] = "modified"
+        self.assertEqual(self.backup_manager.list_backups()[0]["type"], "manual")
+
+        # メタデータファイルの更新が反映されることを確認
+        with open(metadata_file, "r") as f:
+            metadata = json.load(f)
+        metadata["size"] = 12345
+        with open(metadata_file, "w") as f:
+            json.dump(metadata, f)
+        stat = os.stat(metadata_file)
+        os.utime(metadata_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.backup_manager.list_backups()[0]["size"], 12345)
+
+        # 削除されたメタデータはキャッシュからも除外されることを確認
+        self.backup_manager.delete_backup(backup_name)
+        self.assertEqual(self.backup_manager.list_backups(), [])
+        self.assertNotIn(metadata_file, backup_module._metadata_cache)
+
+    def test_list_backups_list_cache(self):
+        """ディレクトリに変更がない場合は一覧キャッシュを返すことのテスト"""
+        backup_name = self.backup_manager.create_backup()
+
+        # 直近に更新されたディレクトリではキャッシュしないことを確認
+        cache_key = os.path.abspath(self.backup_dir)
+        self.assertEqual(len(self.backup_manager.list_backups()), 1)
+        self.assertNotIn(cache_key, backup_module._backups_list_cache)
+
+        # ディレクトリの更新日時を過去にするとキャッシュされる
+        past_ns = (datetime.now().timestamp() - 60) * 1_000_000_000
+        for name in ("metadata", "manual", "auto", "pre_restore"):
+            os.utime(os.path.join(self.backup_dir, name), ns=(int(past_ns), int(past_ns)))
+        first = self.backup_manager.list_backups()
+        self.assertIn(cache_key, backup_module._backups_list_cache)
+
+        # キャッシュ有効時はディレクトリを走査しない
+        with patch("database.backup.os.scandir", side_effect=AssertionError):
+            cached = self.backup_manager.list_backups()
+        self.assertEqual(cached, first)
+
+        # リクエスト毎に生成される別インスタンスでもキャッシュが使われることを確認
+        with patch("database.backup.os.scandir", side_effect=AssertionError):
+            other_manager = BackupManager(
+                db_path=self.db_path,
+                backup_dir=self.backup_dir,
+                env_path=self.env_path,
+                pdf_dir=self.pdf_dir,
+                logs_dir=self.logs_dir,
+                instance_dir=self.instance_dir,
+            )
+            self.assertEqual(other_manager.list_backups(), first)
+
+        # 返却値を変更してもキャッシュに影響しないことを確認
+        cached[0]["type"] = "modified"
+        with patch("database.backup.os.scandir", side_effect=AssertionError):
+            self.assertEqual(self.backup_manager.list_backups()[0]["type"], "manual")
+
+        # 走査中にキャッシュが破棄された場合は走査結果を保存しないことを確認
+        backup_module._backups_list_cache.pop(cache_key)
+        real_load = backup_module._load_json_file
+
+        def load_and_invalidate(path):
+            self.backup_manager._invalidate_backups_cache()
+            return real_load(path)
+
+        with patch("database.backup._load_json_file", side_effect=load_and_invalidate):
+            backup_module._metadata_cache.clear()
+            self.assertEqual(len(self.backup_manager.list_backups()), 1)
+        self.assertNotIn(cache_key, backup_module._backups_list_cache)
+
+        # 削除時にキャッシュが破棄されることを確認
+        self.backup_manager.delete_backup(backup_name)
+        self.assertNotIn(cache_key, backup_module._backups_list_cache)
+        self.assertEqual(self.backup_manager.list_backups(), [])
+
+    def test_delete_backup_fast(self):
+        """取得済みメタデータによるバックアップ削除のテスト"""
+        backup_name = self.backup_manager.create_backup()
+        metadata = self.backup_manager.list_backups()[0]
+
+        # 不正なタイプ・名前のメタデータでは削除しない
+        for invalid in ({"type": "../manual"}, {"backup_name": "../backup"}):
+            self.assertFalse(
+                self.backup_manager._delete_backup_fast({**metadata, **invalid})
+            )
+        self.assertEqual(len(self.backup_manager.list_backups()), 1)
+
+        self.assertTrue(self.backup_manager._delete_backup_fast(metadata))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.backup_dir, "manual", f"{backup_name}.tar.gz")
+        ))
+        self.assertEqual(self.backup_manager.list_backups(), [])
+
     def test_delete_backup(self):
         """バックアップ削除のテスト"""
         # テスト用バックアップ作成
@@ -367,6 +704,26 @@ PASSWORD=sensitive_password_789
             with self.assertRaises((ValueError, OSError)):
                 self.backup_manager.get_backup_path(dangerous_name)
 
+    def test_is_safe_backup_name(self):
+        """バックアップ名の形式チェックのテスト"""
+        self.assertTrue(
+            self.backup_manager._is_safe_backup_name("backup_20250101_120000")
+        )
+        self.assertTrue(
+            self.backup_manager._is_safe_backup_name("pre_restore_20250101_120000")
+        )
+
+        invalid_names = [
+            "backup_20250101_120000\n",
+            "backup_20250101_120000.tar.gz",
+            "backup_2025010_120000",
+            "auto_20250101_120000",
+            "backup_２０２５０１０１_120000",
+            "",
+        ]
+        for name in invalid_names:
+            self.assertFalse(self.backup_manager._is_safe_backup_name(name), name)
+
     def test_backup_integrity_checksum(self):
         """バックアップファイルの整合性チェック（チェックサム）のテスト"""
         backup_name = self.backup_manager.create_backup()
@@ -385,6 +742,42 @@ PASSWORD=sensitive_password_789
         # チェックサムが一致することを確認
         self.assertEqual(stored_checksum, actual_checksum)
 
+    def test_create_pre_restore_backup_shares_archive(self):
+        """復旧前バックアップがアーカイブを再書き込みせずに作成されることを確認"""
+        pre_restore_name = self.backup_manager._create_pre_restore_backup()
+        self.assertIsNotNone(pre_restore_name)
+
+        pre_restore_path = self.backup_manager.get_backup_path(pre_restore_name)
+        self.assertTrue(pre_restore_path.endswith(
+            os.path.join("pre_restore", f"{pre_restore_name}.tar.gz")
+        ))
+
+        metadata_file = os.path.join(
+            self.backup_dir, "metadata", f"{pre_restore_name}.json"
+        )
+        with open(metadata_file, "r") as f:
+            metadata = json.load(f)
+        self.assertEqual(metadata["type"], "pre_restore")
+        self.assertEqual(
+            metadata["checksum"],
+            self.backup_manager._calculate_checksum(pre_restore_path),
+        )
+
+    def test_calculate_checksum_without_file_digest(self):
+        """hashlib.file_digest 非対応環境でも同じチェックサムになることを確認"""
+        test_file = os.path.join(self.test_dir, "checksum.bin")
+        with open(test_file, "wb") as f:
+            f.write(os.urandom(3 * 1024 * 1024 + 123))
+
+        expected = self.backup_manager._calculate_checksum(test_file)
+        with open(test_file, "rb") as f:
+            self.assertEqual(expected, f"sha256:{hashlib.sha256(f.read()).hexdigest()}")
+
+        with patch("database.backup.hashlib", SimpleNamespace(sha256=hashlib.sha256)):
+            self.assertEqual(
+                self.backup_manager._calculate_checksum(test_file), expected
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -121,6 +121,9 @@ class TestBackupManagerPhase2(unittest.TestCase):
             {"retention_days": -1},  # 負の保持日数
             {"backup_time": "25:00"},  # 不正な時刻
             {"max_backup_size": -100},  # 負のサイズ
+            {"compression_level": 0},  # 範囲外の圧縮レベル
+            {"compression_level": 10},  # 範囲外の圧縮レベル
+            {"db_backup_pages": 0},  # 不正なDBバックアップページ数
         ]
 
         for invalid_setting in invalid_settings:
@@ -277,6 +280,16 @@ class TestBackupManagerPhase2(unittest.TestCase):
             self.assertIn(key, stats, f"統計情報に{key}が含まれていません")
 
         self.assertEqual(stats["total_backups"], 3, "総バックアップ数が正しくありません")
+        self.assertEqual(stats["auto_backups"], 2)
+        self.assertEqual(stats["manual_backups"], 1)
+        self.assertEqual(
+            stats["latest_backup"]["created_at"],
+            max(b["created_at"] for b in self.backup_manager.list_backups()),
+        )
+        self.assertEqual(
+            stats["oldest_backup"]["created_at"],
+            min(b["created_at"] for b in self.backup_manager.list_backups()),
+        )
 
     def _create_fake_backup(
         self, backup_name: str, backup_type: str, created_at: datetime
@@ -0,0 +1,526 @@
+"""
+database.models のスキーマ作成・設定・ログ記録関数のテストケース
+"""
+
+import unittest
+import sqlite3
+import tempfile
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database.models
+from database.models import (
+    add_admin_user,
+    bulk_backfill_logs,
+    create_tables,
+    create_indexes,
+    delete_admin_user,
+    get_setting,
+    get_settings,
+    insert_initial_data,
+    invalidate_admin_cache,
+    is_admin,
+    log_access,
+    log_event,
+    set_setting,
+)
+
+
+class TestSchemaCreation(unittest.TestCase):
+    """テーブル・インデックス作成と初期データ投入のテストクラス"""
+
+    def setUp(self):
+        """テストケース毎の初期化"""
+        self.test_db_fd, self.test_db_path = tempfile.mkstemp()
+        self.db = sqlite3.connect(self.test_db_path)
+        self.db.row_factory = sqlite3.Row
+
+    def tearDown(self):
+        """テストケース毎のクリーンアップ"""
+        self.db.close()
+        os.close(self.test_db_fd)
+        os.unlink(self.test_db_path)
+
+    def _trace(self, func, *args):
+        """関数実行中に発行されたSQL文を記録して返す"""
+        statements = []
+        self.db.set_trace_callback(statements.append)
+        try:
+            func(*args)
+        finally:
+            self.db.set_trace_callback(None)
+        return [sql.strip() for sql in statements]
+
+    def test_create_tables_runs_in_single_transaction(self):
+        """テーブル・インデックス作成が1トランザクションで実行されることを確認"""
+        statements = self._trace(create_tables, self.db)
+
+        self.assertEqual(statements[0], "BEGIN")
+        self.assertEqual(statements[-1], "COMMIT")
+        self.assertEqual(statements.count("BEGIN"), 1)
+        self.assertFalse(self.db.in_transaction)
+
+        tables = {
+            row[0]
+            for row in self.db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        self.assertTrue({"access_logs", "settings", "pdf_files"} <= tables)
+
+    def test_log_inserts_do_not_update_sqlite_sequence(self):
+        """ログテーブルへのINSERTで sqlite_sequence が更新されないことを確認"""
+        create_tables(self.db)
+        log_access(self.db, "s", "hash", "127.0.0.1", "ua", "/", "GET", 200)
+        log_event(self.db, "s", "hash", "page_view", {}, "127.0.0.1")
+
+        names = {row[0] for row in self.db.execute("SELECT name FROM sqlite_sequence")}
+        self.assertFalse({"access_logs", "event_logs", "auth_failures"} & names)
+
+    def test_existing_columns_are_not_altered_again(self):
+        """2回目のテーブル作成で ALTER TABLE が発行されないことを確認"""
+        create_tables(self.db)
+        columns = {
+            row[1] for row in self.db.execute("PRAGMA table_info(session_stats)")
+        }
+        self.assertTrue({"memo", "email_address"} <= columns)
+
+        statements = self._trace(create_tables, self.db)
+
+        self.assertFalse([sql for sql in statements if sql.startswith("ALTER TABLE")])
+
+    def test_insert_initial_data_commits_once(self):
+        """初期データ投入が1トランザクションで確定されることを確認"""
+        create_tables(self.db)
+
+        statements = self._trace(insert_initial_data, self.db)
+
+        self.assertEqual(statements.count("BEGIN"), 1)
+        self.assertEqual(statements[-1], "COMMIT")
+        self.assertFalse(self.db.in_transaction)
+        count = self.db.execute("SELECT COUNT(*) FROM settings").fetchone()[0]
+        self.assertGreater(count, 0)
+
+    def test_insert_initial_data_keeps_existing_settings(self):
+        """2回目の初期データ投入で既存の設定が変更されないことを確認"""
+        self.db.row_factory = None
+        create_tables(self.db)
+        insert_initial_data(self.db)
+        passphrase = self.db.execute(
+            "SELECT value FROM settings WHERE key = 'shared_passphrase'"
+        ).fetchone()
+
+        statements = self._trace(insert_initial_data, self.db)
+
+        self.assertFalse([sql for sql in statements if sql.startswith("INSERT")])
+        self.assertEqual(
+            self.db.execute(
+                "SELECT value FROM settings WHERE key = 'shared_passphrase'"
+            ).fetchone(),
+            passphrase,
+        )
+
+    def _query_plan(self, sql, params=()):
+        """EXPLAIN QUERY PLAN の詳細を連結して返す"""
+        rows = self.db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return "\n".join(row[3] for row in rows)
+
+    def test_compound_indexes_avoid_sort(self):
+        """複合インデックスにより絞り込み後の並べ替えが不要になることを確認"""
+        create_tables(self.db)
+
+        plan = self._query_plan(
+            "SELECT * FROM access_logs WHERE session_id = ? ORDER BY access_time",
+            ("s",),
+        )
+        self.assertIn("idx_access_logs_session_time", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+        plan = self._query_plan(
+            "SELECT COUNT(*) FROM auth_failures WHERE ip_address = ? AND attempt_time > ?",
+            ("127.0.0.1", "2025-01-01 00:00:00"),
+        )
+        self.assertIn("idx_auth_failures_ip_time (ip_address=? AND attempt_time>?)", plan)
+
+    def test_stats_queries_use_covering_indexes(self):
+        """期間指定の集計クエリがカバリングインデックスのみで処理されることを確認"""
+        create_tables(self.db)
+
+        for table_name, time_column, group_column, index_name in (
+            ("access_logs", "access_time", "endpoint", "idx_access_logs_time_cover"),
+            ("access_logs", "access_time", "method", "idx_access_logs_time_cover"),
+            (
+                "security_events",
+                "occurred_at",
+                "risk_level",
+                "idx_security_events_time_cover",
+            ),
+        ):
+            plan = self._query_plan(
+                f"SELECT {group_column}, COUNT(*) FROM {table_name} "
+                f"WHERE {time_column} >= ? AND {time_column} <= ? GROUP BY {group_column}",
+                ("2024-01-01 00:00:00", "2024-01-31 23:59:59"),
+            )
+            self.assertIn(f"USING COVERING INDEX {index_name}", plan)
+
+    def test_log_retention_deletes_use_indexes(self):
+        """保持期間・期限切れによる削除がインデックスの範囲検索になることを確認"""
+        create_tables(self.db)
+
+        for table_name, column in (
+            ("access_logs", "access_time"),
+            ("event_logs", "created_at"),
+            ("auth_failures", "attempt_time"),
+            ("ip_blocks", "blocked_until"),
+        ):
+            plan = self._query_plan(
+                f"DELETE FROM {table_name} WHERE {column} < ?",
+                ("2024-01-01 00:00:00",),
+            )
+            self.assertIn(f"({column}<?)", plan, table_name)
+
+    def test_setting_lookup_uses_unique_index(self):
+        """設定キーの検索が UNIQUE 制約の自動インデックスを使うことを確認"""
+        create_tables(self.db)
+
+        plan = self._query_plan(
+            "SELECT value, value_type FROM settings WHERE key = ?", ("k",)
+        )
+        self.assertIn("sqlite_autoindex_settings_1 (key=?)", plan)
+        indexes = {
+            row[0]
+            for row in self.db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        self.assertNotIn("idx_settings_key", indexes)
+
+    def test_create_indexes_drops_superseded_indexes(self):
+        """複合インデックスに置き換えた旧インデックスが削除されることを確認"""
+        create_tables(self.db)
+        self.db.execute(
+            "CREATE INDEX idx_access_logs_session_id ON access_logs(session_id)"
+        )
+
+        create_indexes(self.db)
+
+        indexes = {
+            row[0]
+            for row in self.db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        self.assertNotIn("idx_access_logs_session_id", indexes)
+        self.assertIn("idx_access_logs_session_time", indexes)
+
+    def test_caller_transaction_is_left_open(self):
+        """呼び出し元のトランザクション中はコミットしないことを確認"""
+        create_tables(self.db)
+        self.db.execute("DELETE FROM settings")
+        self.assertTrue(self.db.in_transaction)
+
+        statements = self._trace(create_indexes, self.db)
+
+        self.assertNotIn("BEGIN", statements)
+        self.assertNotIn("COMMIT", statements)
+        self.assertTrue(self.db.in_transaction)
+        self.db.rollback()
+
+    def test_bulk_backfill_logs_recreates_indexes(self):
+        """一括投入後にログのインデックスが再作成されることを確認"""
+        create_tables(self.db)
+        access_rows = [
+            (f"s{i}", "hash", "127.0.0.1", "ua", None, None, "/", "GET", 200,
+             f"2024-01-01 00:00:{i:02d}")
+            for i in range(10)
+        ]
+        event_rows = [
+            ("s0", "hash", "page_view", "{}", 1704067200, "127.0.0.1", None,
+             "2024-01-01 00:00:00")
+        ]
+
+        statements = self._trace(bulk_backfill_logs, self.db, access_rows, event_rows)
+
+        self.assertEqual(statements.count("BEGIN"), 1)
+        self.assertIn("DROP INDEX IF EXISTS idx_access_logs_session_time", statements)
+        self.assertEqual(statements[-1], "COMMIT")
+        self.assertEqual(
+            self.db.execute("SELECT COUNT(*) FROM access_logs").fetchone()[0], 10
+        )
+        indexes = {
+            row[0]
+            for row in self.db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        self.assertTrue(
+            {"idx_access_logs_session_time", "idx_event_logs_type_time"} <= indexes
+        )
+
+
+class TestSettings(unittest.TestCase):
+    """設定値の取得・更新のテストクラス"""
+
+    def setUp(self):
+        """テストケース毎の初期化"""
+        self.db = sqlite3.connect(":memory:")
+        self.db.row_factory = sqlite3.Row
+        create_tables(self.db)
+        insert_initial_data(self.db)
+
+    def tearDown(self):
+        """テストケース毎のクリーンアップ"""
+        self.db.close()
+
+    def test_get_setting_converts_type(self):
+        """value_type に応じて型変換されることを確認"""
+        self.assertEqual(get_setting(self.db, "session_timeout"), 259200)
+        self.assertIs(get_setting(self.db, "session_limit_enabled"), True)
+        self.assertEqual(get_setting(self.db, "missing_key", "default"), "default")
+
+    def test_get_settings_reads_multiple_keys(self):
+        """複数の設定値を1回のクエリで取得できることを確認"""
+        statements = []
+        self.db.set_trace_callback(statements.append)
+        try:
+            settings = get_settings(
+                self.db,
+                {
+                    "session_timeout": 0,
+                    "session_limit_enabled": False,
+                    "missing_key": "default",
+                },
+            )
+        finally:
+            self.db.set_trace_callback(None)
+
+        self.assertEqual(
+            settings,
+            {
+                "session_timeout": 259200,
+                "session_limit_enabled": True,
+                "missing_key": "default",
+            },
+        )
+        self.assertEqual(len(statements), 1)
+
+    def test_set_setting_updates_and_records_history(self):
+        """設定更新時に値と変更履歴が記録されることを確認"""
+        set_setting(self.db, "session_timeout", 3600, "admin@example.com")
+        set_setting(self.db, "new_key", "value", "admin@example.com")
+
+        self.assertEqual(get_setting(self.db, "session_timeout"), 3600)
+        self.assertEqual(get_setting(self.db, "new_key"), "value")
+
+        history = self.db.execute(
+            "SELECT setting_key, old_value, new_value, changed_by "
+            "FROM settings_history ORDER BY id"
+        ).fetchall()
+        self.assertEqual(
+            [tuple(row) for row in history],
+            [
+                ("session_timeout", "259200", "3600", "admin@example.com"),
+                ("new_key", None, "value", "admin@example.com"),
+            ],
+        )
+
+    def test_set_setting_does_not_read_old_value_separately(self):
+        """設定更新時に変更前の値を別のSELECTで読み取らないことを確認"""
+        statements = []
+        self.db.set_trace_callback(statements.append)
+        try:
+            set_setting(self.db, "session_timeout", 3600, "admin@example.com")
+        finally:
+            self.db.set_trace_callback(None)
+
+        self.assertFalse(
+            [sql for sql in statements if sql.strip().startswith("SELECT")]
+        )
+
+    def test_direct_update_records_history(self):
+        """set_setting を経由しない更新でも変更履歴が記録されることを確認"""
+        self.db.execute(
+            "UPDATE settings SET value = '2025-01-01 00:00:00' WHERE key = 'publish_end'"
+        )
+        self.db.execute("DELETE FROM settings_history")
+        self.db.execute(
+            "UPDATE settings SET value = NULL, updated_by = 'scheduler' "
+            "WHERE key = 'publish_end'"
+        )
+        self.db.execute(
+            "UPDATE settings SET value = '60', updated_by = 'admin@example.com' "
+            "WHERE key = 'session_timeout'"
+        )
+
+        history = self.db.execute(
+            "SELECT setting_key, new_value, changed_by FROM settings_history ORDER BY id"
+        ).fetchall()
+        self.assertEqual(
+            [tuple(row) for row in history],
+            [
+                ("publish_end", None, "scheduler"),
+                ("session_timeout", "60", "admin@example.com"),
+            ],
+        )
+
+    def test_unchanged_value_is_not_recorded(self):
+        """値が変わらない更新では変更履歴が記録されないことを確認"""
+        set_setting(self.db, "session_timeout", "60", "admin@example.com")
+        set_setting(self.db, "session_timeout", "60", "other@example.com")
+
+        history = self.db.execute(
+            "SELECT new_value, changed_by FROM settings_history "
+            "WHERE setting_key = 'session_timeout'"
+        ).fetchall()
+        self.assertEqual([tuple(row) for row in history], [("60", "admin@example.com")])
+
+    def test_create_tables_replaces_existing_trigger(self):
+        """既存データベースの旧トリガー定義が作り直されることを確認"""
+        self.db.execute("DROP TRIGGER trg_settings_history")
+        self.db.execute(
+            "CREATE TRIGGER trg_settings_history AFTER UPDATE OF value ON settings "
+            "BEGIN INSERT INTO settings_history (setting_key, old_value, new_value, changed_by) "
+            "VALUES (NEW.key, OLD.value, NEW.value, 'system'); END"
+        )
+
+        create_tables(self.db)
+
+        sql = self.db.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'trg_settings_history'"
+        ).fetchone()[0]
+        self.assertIn("WHEN OLD.value IS NOT NEW.value", sql)
+
+    def test_get_setting_keeps_row_factory(self):
+        """設定値の取得が接続の row_factory を変更しないことを確認"""
+        self.db.row_factory = None
+        self.assertEqual(get_setting(self.db, "session_timeout"), 259200)
+        self.assertIsNone(self.db.row_factory)
+
+
+class TestAdminCache(unittest.TestCase):
+    """管理者判定キャッシュのテストクラス"""
+
+    def setUp(self):
+        """テストケース毎の初期化"""
+        self.test_db_fd, self.test_db_path = tempfile.mkstemp()
+        import database
+
+        self.db_patcher = patch.object(database, "DATABASE_PATH", self.test_db_path)
+        self.db_patcher.start()
+        with sqlite3.connect(self.test_db_path) as conn:
+            create_tables(conn)
+            conn.execute(
+                "INSERT INTO admin_users (email, added_by, is_active) "
+                "VALUES ('admin@example.com', 'system', TRUE)"
+            )
+
+    def tearDown(self):
+        """テストケース毎のクリーンアップ"""
+        invalidate_admin_cache()
+        self.db_patcher.stop()
+        os.close(self.test_db_fd)
+        os.unlink(self.test_db_path)
+
+    def _set_active(self, email, is_active):
+        with sqlite3.connect(self.test_db_path) as conn:
+            conn.execute(
+                "UPDATE admin_users SET is_active = ? WHERE email = ?",
+                (is_active, email),
+            )
+
+    def test_deactivation_is_reflected_immediately(self):
+        """管理者と判定された結果はキャッシュされず、無効化が即時反映されることを確認"""
+        self.assertTrue(is_admin("admin@example.com"))
+
+        self._set_active("admin@example.com", False)
+        self.assertFalse(is_admin("admin@example.com"))
+
+    def test_negative_result_is_cached(self):
+        """管理者でない判定結果がキャッシュされ、破棄後に再取得されることを確認"""
+        self._set_active("admin@example.com", False)
+        self.assertFalse(is_admin("admin@example.com"))
+
+        self._set_active("admin@example.com", True)
+        self.assertFalse(is_admin("admin@example.com"))
+
+        invalidate_admin_cache("admin@example.com")
+        self.assertTrue(is_admin("admin@example.com"))
+
+    def test_negative_cache_is_bounded(self):
+        """否定結果キャッシュが上限件数を超えて増えないことを確認"""
+        with patch("database.models._ADMIN_CACHE_MAX_ENTRIES", 2):
+            for i in range(5):
+                self.assertFalse(is_admin(f"user{i}@example.com"))
+
+        self.assertEqual(
+            [key[1] for key in database.models._admin_cache],
+            ["user3@example.com", "user4@example.com"],
+        )
+
+    def test_expired_negative_entries_are_evicted(self):
+        """期限切れの否定結果が次のキャッシュ登録時に破棄されることを確認"""
+        with patch("database.models.time.monotonic", return_value=1000.0):
+            self.assertFalse(is_admin("old@example.com"))
+        with patch("database.models.time.monotonic", return_value=2000.0):
+            self.assertFalse(is_admin("new@example.com"))
+
+        self.assertEqual(
+            [key[1] for key in database.models._admin_cache], ["new@example.com"]
+        )
+
+    def test_admin_changes_invalidate_cache(self):
+        """管理者の追加・削除でキャッシュが破棄されることを確認"""
+        # 操作ログは別接続で書き込まれ、ロック待ちになるため記録しない
+        log_patcher = patch("database.models.log_admin_operation")
+        log_patcher.start()
+        self.addCleanup(log_patcher.stop)
+
+        self.assertFalse(is_admin("new@example.com"))
+        self.assertTrue(add_admin_user("new@example.com", "admin@example.com"))
+        self.assertTrue(is_admin("new@example.com"))
+
+        with sqlite3.connect(self.test_db_path) as conn:
+            admin_id = conn.execute(
+                "SELECT id FROM admin_users WHERE email = 'new@example.com'"
+            ).fetchone()[0]
+        self.assertTrue(delete_admin_user(admin_id))
+        self.assertFalse(is_admin("new@example.com"))
+
+
+class TestLogWriters(unittest.TestCase):
+    """ログ記録関数のテストクラス"""
+
+    def setUp(self):
+        """テストケース毎の初期化"""
+        self.db = sqlite3.connect(":memory:")
+        create_tables(self.db)
+
+    def tearDown(self):
+        """テストケース毎のクリーンアップ"""
+        self.db.close()
+
+    def test_log_access_inserts_row(self):
+        """アクセスログが1行記録されることを確認"""
+        log_access(self.db, "s", "hash", "127.0.0.1", "ua", "/", "GET", 200)
+
+        row = self.db.execute(
+            "SELECT session_id, endpoint, status_code FROM access_logs"
+        ).fetchone()
+        self.assertEqual(row, ("s", "/", 200))
+
+    def test_log_event_stores_compact_json(self):
+        """イベントデータが空白・エスケープなしのJSONで保存されることを確認"""
+        log_event(
+            self.db, "s", "hash", "page_view", {"page": 1, "title": "資料"},
+            "127.0.0.1", device_info={"type": "web"},
+        )
+
+        row = self.db.execute("SELECT event_data, device_info FROM event_logs").fetchone()
+        self.assertEqual(row, ('{"page":1,"title":"資料"}', '{"type":"web"}'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,260 @@
+"""
+データベースマイグレーションのテストケース
+
+- 未適用マイグレーションの適用
+- 既存カラムがある場合の冪等性
+"""
+
+import unittest
+import sqlite3
+import tempfile
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.models import create_tables, insert_initial_data
+from database.migrations import (
+    run_all_migrations,
+    run_migration_001,
+    run_migration_002,
+    run_migration_003,
+    get_applied_migrations,
+    migrate_password_to_passphrase,
+    validate_passphrase,
+)
+
+
+class TestValidatePassphrase(unittest.TestCase):
+    """マイグレーション用パスフレーズ検証のテストクラス"""
+
+    def test_valid_passphrases(self):
+        """有効なパスフレーズが受け入れられることを確認"""
+        for passphrase in ("a" * 32, "A1_-" * 8, "z" * 128):
+            is_valid, _ = validate_passphrase(passphrase)
+            self.assertTrue(is_valid, passphrase)
+
+    def test_invalid_passphrases(self):
+        """無効なパスフレーズが拒否されることを確認"""
+        for passphrase in (
+            None,
+            "",
+            "a" * 31,
+            "a" * 129,
+            "a" * 31 + "\n",  # 末尾の改行
+            "a" * 31 + "!",  # 記号
+            "a" * 31 + "ａ",  # 全角文字
+        ):
+            is_valid, _ = validate_passphrase(passphrase)
+            self.assertFalse(is_valid, repr(passphrase))
+
+
+class TestMigrations(unittest.TestCase):
+    """マイグレーション実行のテストクラス"""
+
+    def setUp(self):
+        """テストケース毎の初期化"""
+        self.test_db_fd, self.test_db_path = tempfile.mkstemp()
+
+        self.db = sqlite3.connect(self.test_db_path)
+        self.db.row_factory = sqlite3.Row
+
+        create_tables(self.db)
+        insert_initial_data(self.db)
+        self.db.commit()
+
+    def tearDown(self):
+        """テストケース毎のクリーンアップ"""
+        self.db.close()
+        os.close(self.test_db_fd)
+        os.unlink(self.test_db_path)
+
+    def _run_all_migrations(self):
+        """マイグレーションを実行し、出力されたログメッセージを返す"""
+        with self.assertLogs("database.migrations", level="INFO") as logs:
+            run_all_migrations(self.db)
+        self.db.commit()
+        return "\n".join(logs.output)
+
+    def _columns(self, table_name):
+        return {row[1] for row in self.db.execute(f"PRAGMA table_info({table_name})")}
+
+    def test_run_all_migrations_adds_missing_columns(self):
+        """不足しているカラムが追加されることを確認"""
+        self._run_all_migrations()
+
+        self.assertTrue(
+            {"user_email", "duration_seconds", "pdf_file_path"}
+            <= self._columns("access_logs")
+        )
+        self.assertTrue(
+            {"published_date", "unpublished_date"} <= self._columns("pdf_files")
+        )
+        self.assertIn("role", self._columns("admin_users"))
+        self.assertIn("event_type", self._columns("security_events"))
+
+        applied = get_applied_migrations(self.db)
+        for name in (
+            "001_password_to_passphrase",
+            "002_security_event_logging",
+            "003_pdf_table_columns",
+            "004_admin_role_session_management",
+        ):
+            self.assertIn(name, applied)
+
+    def test_existing_columns_are_not_altered_again(self):
+        """既存カラムに対して ALTER TABLE が発行されないことを確認"""
+        # pdf_files は create_tables 時点で公開日カラムを持つ
+        statements = []
+        self.db.set_trace_callback(statements.append)
+        try:
+            output = self._run_all_migrations()
+        finally:
+            self.db.set_trace_callback(None)
+
+        self.assertIn("published_date column already exists", output)
+        self.assertFalse(
+            [sql for sql in statements if "ALTER TABLE pdf_files" in sql]
+        )
+
+    def test_migration_003_adds_only_missing_column(self):
+        """003 が不足しているカラムのみ追加することを確認"""
+        self.db.execute("ALTER TABLE pdf_files DROP COLUMN unpublished_date")
+        self.db.commit()
+
+        statements = []
+        self.db.set_trace_callback(statements.append)
+        try:
+            self._run_all_migrations()
+        finally:
+            self.db.set_trace_callback(None)
+
+        self.assertIn("unpublished_date", self._columns("pdf_files"))
+        self.assertEqual(
+            [sql.strip() for sql in statements if "ALTER TABLE pdf_files" in sql],
+            ["ALTER TABLE pdf_files ADD COLUMN unpublished_date TEXT;"],
+        )
+
+    def test_migrate_password_keeps_row_factory(self):
+        """パスワード移行が接続の row_factory を変更しないことを確認"""
+        db = sqlite3.connect(self.test_db_path)
+        try:
+            db.execute("DELETE FROM settings WHERE key = 'shared_passphrase'")
+            db.execute(
+                "INSERT INTO settings (key, value) VALUES ('shared_password', ?)",
+                ("p" * 32,),
+            )
+
+            migrate_password_to_passphrase(db)
+
+            self.assertIsNone(db.row_factory)
+            self.assertEqual(
+                db.execute(
+                    "SELECT value FROM settings WHERE key = 'shared_passphrase'"
+                ).fetchone(),
+                ("p" * 32,),
+            )
+            self.assertIsNone(
+                db.execute(
+                    "SELECT value FROM settings WHERE key = 'shared_password'"
+                ).fetchone()
+            )
+        finally:
+            db.close()
+
+    def test_run_all_migrations_restores_pragmas(self):
+        """マイグレーション後に接続の PRAGMA が元の値に戻ることを確認"""
+        before = {
+            name: self.db.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("temp_store", "cache_size", "busy_timeout")
+        }
+
+        self._run_all_migrations()
+
+        for name, value in before.items():
+            self.assertEqual(self.db.execute(f"PRAGMA {name}").fetchone()[0], value)
+
+    def test_migration_002_rolls_back_on_failure(self):
+        """002 の途中で失敗した場合にDDL全体がロールバックされることを確認"""
+        # 最後のインデックス名と衝突するテーブルを作成して失敗させる
+        self.db.execute("CREATE TABLE idx_access_logs_pdf_file_path (id INTEGER)")
+        self.db.commit()
+
+        with self.assertRaises(sqlite3.OperationalError):
+            self._run_all_migrations()
+
+        self.assertFalse(self.db.in_transaction)
+        self.assertNotIn("user_email", self._columns("access_logs"))
+        self.assertNotIn(
+            "002_security_event_logging", get_applied_migrations(self.db)
+        )
+
+    def _assert_lock_error_is_raised(self, migration):
+        """書き込みロック取得に失敗した場合に元の例外が送出されることを確認"""
+        locker = sqlite3.connect(self.test_db_path)
+        locker.execute("BEGIN IMMEDIATE")
+        db = sqlite3.connect(self.test_db_path, timeout=0)
+        try:
+            with self.assertLogs("database.migrations", level="ERROR"):
+                with self.assertRaisesRegex(sqlite3.OperationalError, "locked"):
+                    migration(db)
+            self.assertFalse(db.in_transaction)
+        finally:
+            db.close()
+            locker.rollback()
+            locker.close()
+
+    def test_migrations_keep_lock_error_when_begin_fails(self):
+        """BEGIN IMMEDIATE の失敗が ROLLBACK のエラーで置き換えられないことを確認"""
+        self._assert_lock_error_is_raised(run_migration_001)
+        self._assert_lock_error_is_raised(run_migration_002)
+        self._assert_lock_error_is_raised(run_migration_003)
+
+    def test_migration_002_keeps_security_event_indexes_consistent(self):
+        """002 が create_indexes で削除される旧インデックスを再作成しないことを確認"""
+        self._run_all_migrations()
+
+        indexes = {
+            row[0]
+            for row in self.db.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'security_events'"
+            )
+        }
+        self.assertIn("idx_security_events_time_cover", indexes)
+        self.assertNotIn("idx_security_events_occurred_at", indexes)
+
+    def test_run_all_migrations_is_idempotent(self):
+        """2回目の実行でスキーマが変化しないことを確認"""
+        self._run_all_migrations()
+        schema_before = self.db.execute(
+            "SELECT sql FROM sqlite_master ORDER BY rowid"
+        ).fetchall()
+
+        run_all_migrations(self.db)
+        self.db.commit()
+        schema_after = self.db.execute(
+            "SELECT sql FROM sqlite_master ORDER BY rowid"
+        ).fetchall()
+
+        self.assertEqual(
+            [tuple(row) for row in schema_before], [tuple(row) for row in schema_after]
+        )
+
+    def test_run_all_migrations_without_pending(self):
+        """未適用マイグレーションがない場合は何も実行しないことを確認"""
+        self._run_all_migrations()
+
+        statements = []
+        self.db.set_trace_callback(statements.append)
+        try:
+            with self.assertNoLogs("database.migrations"):
+                run_all_migrations(self.db)
+        finally:
+            self.db.set_trace_callback(None)
+
+        self.assertEqual(len(statements), 1)
+        self.assertIn("FROM migrations", statements[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -227,6 +227,27 @@ class TestRateLimitingManager:
         stats = rate_limiter.get_rate_limit_stats()
         assert stats['active_blocks_count'] >= 1
     
+    def test_today_failures_count_uses_date_range(self, temp_db):
+        """今日の認証失敗数が日付範囲で集計されることを確認"""
+        from database.utils import RateLimitManager
+        from config.timezone import get_app_now
+        
+        now = get_app_now()
+        for attempt_time in (
+            (now - timedelta(days=1)).strftime('%Y-%m-%d 23:59:59'),
+            now.strftime('%Y-%m-%d 00:00:00'),
+            now.strftime('%Y-%m-%d 23:59:59'),
+            (now + timedelta(days=1)).strftime('%Y-%m-%d 00:00:00'),
+        ):
+            temp_db.execute(
+                "INSERT INTO auth_failures (ip_address, failure_type, attempt_time) VALUES (?, ?, ?)",
+                ("192.168.1.50", "test_failure", attempt_time)
+            )
+        temp_db.commit()
+        
+        stats = RateLimitManager(temp_db).get_rate_limit_stats()
+        assert stats['today_failures_count'] == 2
+    
     def test_auto_unblock_functionality(self, temp_db):
         """自動制限解除機能のテスト"""
         from database.utils import RateLimitManager
@@ -124,6 +124,16 @@ class TestTimezoneUnification(unittest.TestCase):
         formatted = format_for_display(test_dt)
         self.assertIn('2025年03月15日', formatted)
         self.assertIn('09:30:00', formatted)
+        # 同一秒の再フォーマットはキャッシュ結果と一致すること
+        self.assertEqual(format_for_display(test_dt.replace(microsecond=500)), formatted)
+        # 別の秒は再フォーマットされること
+        self.assertIn('09:30:01', format_for_display(test_dt + timedelta(seconds=1)))
+        # 1970年前後の1秒未満の時刻が同じ秒として扱われないこと
+        after_epoch = pytz.UTC.localize(datetime(1970, 1, 1, 0, 0, 0, 200000))
+        before_epoch = pytz.UTC.localize(datetime(1969, 12, 31, 23, 59, 59, 500000))
+        self.assertNotEqual(
+            format_for_display(after_epoch), format_for_display(before_epoch)
+        )
         
         # get_timezone_info テスト
         tz_info = get_timezone_info()